@@ -4,10 +4,14 @@ Interactive demonstration of the narrative context system + PDF export
 """
 
 import streamlit as st
+import os
 import sys
 from pathlib import Path
 import random
+import time
+from contextlib import contextmanager
 from datetime import datetime
+import pandas as pd
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
@@ -21,6 +25,8 @@ except ImportError as e:
     st.info("Make sure all files are in the correct locations. See README.md for setup instructions.")
     st.stop()
 
+from ui_constants import CSS, VARIATIONS, VARIATION_LABELS, VARIATION_NAMES, ASSESSMENTS, ASSESSMENT_LABELS, LEVEL_LABELS, ANSWER_KEY_TYPES, DIFF_LABELS, DIFF_ORDER, QUIZ_DIFFS, TEST_DIFF_CYCLE, EXAMPLES, CATEGORIES_INFO, PDFSettings
+
 # Import PDF generator
 try:
     from math_pdf_generator import MathAssessmentGenerator
@@ -36,78 +42,121 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #1E88E5;
-        margin-bottom: 0;
-    }
-    .sub-header {
-        font-size: 1.2rem;
-        color: #666;
-        margin-top: 0;
-    }
-    .context-box {
-        background-color: #f0f8ff;
-        padding: 20px;
-        border-radius: 10px;
-        border-left: 5px solid #1E88E5;
-        margin: 10px 0;
-    }
-    .question-box {
-        background-color: #fff;
-        padding: 20px;
-        border-radius: 10px;
-        border: 2px solid #ddd;
-        margin: 10px 0;
-    }
-    .answer-box {
-        background-color: #e8f5e9;
-        padding: 15px;
-        border-radius: 10px;
-        border-left: 5px solid #4CAF50;
-        margin: 10px 0;
-    }
-    .stats-card {
-        background-color: #fff;
-        padding: 15px;
-        border-radius: 10px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        margin: 5px 0;
-    }
-    .pdf-section {
-        background-color: #fff3e0;
-        padding: 20px;
-        border-radius: 10px;
-        border-left: 5px solid #FF9800;
-        margin: 20px 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS (re-sent every run: Streamlit drops elements a rerun does not emit)
+st.markdown(CSS, unsafe_allow_html=True)
+
+# Data files
+WORKSHEET_PATH = "data/WorksheetMergeMasterSourceFile.xlsx"
+CONTEXT_BANKS_PATH = "data/ContextBanks.xlsx"
+
+def _data_mtimes():
+    """Modification times of the data files, used as the load_system cache key"""
+    return tuple(
+        os.path.getmtime(path) if os.path.exists(path) else None
+        for path in (WORKSHEET_PATH, CONTEXT_BANKS_PATH)
+    )
 
 # Initialize
-@st.cache_resource
-def load_system():
-    """Load the context engine system (cached)"""
+@st.cache_resource(max_entries=1)
+def load_system(data_mtimes):
+    """Load the context engine system (cached until a data file changes)"""
     try:
-        data_manager = DataManager("data/WorksheetMergeMasterSourceFile.xlsx")
-        generator = MeanGeneratorV2(data_manager, "data/ContextBanks.xlsx")
+        data_manager = DataManager(WORKSHEET_PATH)
+        generator = MeanGeneratorV2(data_manager, CONTEXT_BANKS_PATH)
         pdf_generator = MathAssessmentGenerator() if MathAssessmentGenerator else None
-        return generator, pdf_generator
+        
+        # Context metadata table keyed by context id, built once instead of per rerun
+        meta_columns = ['Category', 'ContextName', 'Description', 'ValueMin', 'ValueMax', 'Unit']
+        meta_table = {
+            ctx_id: {col: meta.get(col) for col in meta_columns}
+            for ctx_id, meta in generator.engine.metadata_index.items()
+        }
+        return generator, pdf_generator, meta_table
     except Exception as e:
         st.error(f"Error loading system: {e}")
-        return None, None
+        return None, None, None
 
-# Load generators
-generator, pdf_generator = load_system()
+# Load generators (the derived caches below take data_version too, so a data edit refreshes them)
+data_version = _data_mtimes()
+generator, pdf_generator, meta_table = load_system(data_version)
 
 if generator is None:
     st.error("⚠️ Could not load the context engine. Check that all files are present.")
     st.stop()
 
+@st.cache_data(show_spinner=False)
+def _compat(data_version, variation):
+    """Context ids that support a variation (cached across reruns until the data changes)"""
+    return generator.engine.get_compatible_contexts(variation)
+
+@st.cache_resource(max_entries=1)
+def variation_compat(data_version):
+    """variation -> frozenset of compatible context ids, for unions and membership tests"""
+    return {variation: frozenset(_compat(data_version, variation)) for variation in VARIATION_LABELS}
+
+def _context_name(context_id):
+    """format_func for widgets whose options are context ids"""
+    return meta_table[context_id]['ContextName']
+
+@st.cache_data(show_spinner=False)
+def _grouped(data_version, variation):
+    """
+    Compatible contexts grouped by category (cached per data version and variation)
+    
+    Returns:
+        (sorted category names, {category: [ctx_id sorted by name]})
+    """
+    context_by_category = {}
+    for ctx_id in sorted(_compat(data_version, variation), key=_context_name):
+        context_by_category.setdefault(meta_table[ctx_id]['Category'], []).append(ctx_id)
+    return sorted(context_by_category), context_by_category
+
+@st.cache_resource(max_entries=1)
+def context_table(data_version):
+    """One row per context (ctx_id, name, category) plus a boolean column per variation"""
+    ctx_df = pd.DataFrame({
+        'ctx_id': list(meta_table),
+        'name': [meta['ContextName'] for meta in meta_table.values()],
+        'category': [meta['Category'] for meta in meta_table.values()],
+    })
+    for variation in VARIATION_LABELS:
+        ctx_df[variation] = ctx_df['ctx_id'].isin(_compat(data_version, variation))
+    return ctx_df
+
+@st.cache_data(show_spinner=False)
+def _compat_union(data_version, vars_key):
+    """Context ids compatible with ANY of the variations, sorted by name (cached per data version and sorted tuple)"""
+    compat = variation_compat(data_version)
+    return sorted(frozenset().union(*(compat[v] for v in vars_key)), key=_context_name)
+
+@st.cache_data(show_spinner=False)
+def _compat_intersection(data_version, vars_key):
+    """Context ids compatible with ALL of the variations, in context table order (cached per data version and sorted tuple)"""
+    ctx_df = context_table(data_version)
+    return ctx_df.loc[ctx_df[list(vars_key)].all(axis=1), 'ctx_id'].tolist()
+
+@st.cache_data(show_spinner=False)
+def compute_contexts(data_version, vars_key, cats_key):
+    """(ctx_id, name, category) for contexts compatible with any of the variations
+    in the given categories, sorted by category then name"""
+    ctx_df = context_table(data_version)
+    matches = ctx_df[ctx_df[list(vars_key)].any(axis=1) & ctx_df['category'].isin(cats_key)]
+    return list(
+        matches.sort_values(['category', 'name'])[['ctx_id', 'name', 'category']]
+        .itertuples(index=False, name=None)
+    )
+
+@st.cache_data(show_spinner=False)
+def _context_details(data_version, context_id):
+    """Markdown for the Context Details expander (cached per data version and context)"""
+    meta = meta_table[context_id]
+    return (
+        f"**{meta['ContextName']}**\n\n"
+        f"{meta['Description']}\n\n"
+        f"**Range:** {meta['ValueMin']}-{meta['ValueMax']} {meta['Unit']}\n\n"
+        f"**Category:** {meta['Category']}"
+    )
+
 # Initialize session state
 if 'mode' not in st.session_state:
     st.session_state.mode = 'single'  # 'single' or 'pdf'
@@ -116,29 +165,37 @@ if 'mode' not in st.session_state:
 st.markdown('<p class="main-header">🎨 Context Engine Demo</p>', unsafe_allow_html=True)
 st.markdown('<p class="sub-header">Generate Statistics Questions with Rich Narratives</p>', unsafe_allow_html=True)
 
-# Mode selector
+# Mode selector (callbacks switch mode before this run renders, so no extra rerun)
+def _set_mode(mode):
+    st.session_state.mode = mode
+
 col_mode1, col_mode2 = st.columns(2)
 with col_mode1:
-    if st.button("📝 Single Question Mode", use_container_width=True, 
-                 type="primary" if st.session_state.mode == 'single' else "secondary"):
-        st.session_state.mode = 'single'
-        st.rerun()
+    st.button("📝 Single Question Mode", use_container_width=True, 
+              type="primary" if st.session_state.mode == 'single' else "secondary",
+              on_click=_set_mode, args=('single',))
 
 with col_mode2:
-    if st.button("📄 PDF Generation Mode", use_container_width=True,
-                 type="primary" if st.session_state.mode == 'pdf' else "secondary",
-                 disabled=pdf_generator is None):
-        st.session_state.mode = 'pdf'
-        st.rerun()
+    st.button("📄 PDF Generation Mode", use_container_width=True,
+              type="primary" if st.session_state.mode == 'pdf' else "secondary",
+              disabled=pdf_generator is None,
+              on_click=_set_mode, args=('pdf',))
 
 st.markdown("---")
 
 # =======================
 # SINGLE QUESTION MODE
 # =======================
-if st.session_state.mode == 'single':
-    
-    # Sidebar
+@st.fragment
+def stats_panel(variation):
+    """System stats for the sidebar; the compatible count comes from the cached _compat"""
+    st.subheader("📊 System Stats")
+    st.metric("Total Contexts", 50)
+    st.metric("Compatible with this variation", len(_compat(data_version, variation)))
+    st.metric("Narrative Levels", 3)
+
+def render_single_sidebar():
+    """Sidebar controls for single question mode"""
     with st.sidebar:
         st.header("⚙️ Question Generator")
         
@@ -146,18 +203,13 @@ if st.session_state.mode == 'single':
         st.subheader("1️⃣ Math Variation")
         variation = st.selectbox(
             "Select variation",
-            ["calculate", "missing_value", "compare", "missing_count"],
-            format_func=lambda x: {
-                "calculate": "📊 Calculate Mean",
-                "missing_value": "🎯 Find Missing Value",
-                "compare": "⚖️ Compare Means",
-                "missing_count": "🔢 Find Number of Values"
-            }[x],
+            VARIATIONS,
+            format_func=VARIATION_LABELS.__getitem__,
             help="Choose which type of mean question to generate"
         )
         
         # Get compatible contexts
-        compatible_contexts = generator.engine.get_compatible_contexts(variation)
+        compatible_contexts = _compat(data_version, variation)
         
         st.subheader("2️⃣ Context")
         
@@ -169,414 +221,405 @@ if st.session_state.mode == 'single':
         
         if context_mode == "🎯 Choose specific context":
             # Group contexts by category
-            context_by_category = {}
-            for ctx_id in compatible_contexts:
-                meta = generator.engine.get_context_metadata(ctx_id)
-                category = meta['Category']
-                if category not in context_by_category:
-                    context_by_category[category] = []
-                context_by_category[category].append((ctx_id, meta['ContextName']))
+            categories, context_by_category = _grouped(data_version, variation)
             
             # Category selector
-            categories = sorted(context_by_category.keys())
             category = st.selectbox("Category", categories)
             
             # Context selector within category
-            contexts_in_category = context_by_category[category]
-            context_choice = st.selectbox(
+            context_id = st.selectbox(
                 "Context",
-                contexts_in_category,
-                format_func=lambda x: x[1]
+                context_by_category[category],
+                format_func=_context_name
             )
-            context_id = context_choice[0]
             
             # Show context info
-            meta = generator.engine.get_context_metadata(context_id)
             with st.expander("ℹ️ Context Details"):
-                st.write(f"**{meta['ContextName']}**")
-                st.write(meta['Description'])
-                st.write(f"**Range:** {meta['ValueMin']}-{meta['ValueMax']} {meta['Unit']}")
-                st.write(f"**Category:** {meta['Category']}")
+                st.markdown(_context_details(data_version, context_id))
         else:
             context_id = None
             st.info(f"Will randomly select from {len(compatible_contexts)} compatible contexts")
         
-        st.subheader("3️⃣ Narrative Level")
-        level = st.select_slider(
-            "Detail level",
-            options=["minimal", "standard", "rich"],
-            value="standard",
-            format_func=lambda x: {
-                "minimal": "📄 Minimal (1 sentence)",
-                "standard": "📖 Standard (Brief scenario)",
-                "rich": "📚 Rich (Full backstory)"
-            }[x],
-            help="Choose how much narrative detail to include"
-        )
-        
-        st.subheader("4️⃣ Difficulty")
-        difficulty = st.slider(
-            "Difficulty level",
-            min_value=1,
-            max_value=5,
-            value=2,
-            help="1 = Easy, 5 = Hard"
-        )
-        
-        st.markdown("---")
-        
-        # Generate button
-        if st.button("🎲 Generate Question", type="primary", use_container_width=True):
-            st.session_state.generate = True
+        # Level and difficulty only matter once a question is generated, so send them
+        # with the Generate button instead of rerunning on every change
+        with st.form("generator_form", border=False):
+            st.subheader("3️⃣ Narrative Level")
+            level = st.select_slider(
+                "Detail level",
+                options=["minimal", "standard", "rich"],
+                value="standard",
+                format_func=LEVEL_LABELS.__getitem__,
+                help="Choose how much narrative detail to include"
+            )
+            
+            st.subheader("4️⃣ Difficulty")
+            difficulty = st.slider(
+                "Difficulty level",
+                min_value=1,
+                max_value=5,
+                value=2,
+                help="1 = Easy, 5 = Hard"
+            )
+            
+            st.markdown("---")
+            
+            # Generate button
+            if st.form_submit_button("🎲 Generate Question", type="primary", use_container_width=True):
+                st.session_state.generate = True
         
         # Show stats
         st.markdown("---")
-        st.subheader("📊 System Stats")
-        st.metric("Total Contexts", 50)
-        st.metric("Compatible with this variation", len(compatible_contexts))
-        st.metric("Narrative Levels", 3)
+        stats_panel(variation)
 
-    # Main content
-    col1, col2 = st.columns([2, 1])
+    return variation, context_id, level, difficulty
 
-    with col1:
-        st.header("Generated Question")
+def _request_question(random_context=False):
+    """Regenerate button callback: generate a question on this run"""
+    st.session_state.generate = True
+    st.session_state.random_context = random_context
+
+def _cancel_question():
+    """Change variation button callback: wait for the sidebar Generate button"""
+    st.session_state.generate = False
+
+def render_question_panel(variation, context_id, level, difficulty):
+    """Generated question with answer toggle and regenerate options"""
+    st.header("Generated Question")
+    
+    if st.session_state.get('generate', False):
+        with st.spinner("🎨 Crafting your question..."):
+            try:
+                # Generate question
+                if st.session_state.pop('random_context', False):
+                    context_id = None
+                
+                question = generator.generate(
+                    variation=variation,
+                    difficulty=difficulty,
+                    context_id=context_id,
+                    level=level
+                )
+                
+                # Store in session
+                st.session_state.question = question
+                st.session_state.generate = False
+                
+                st.success("✅ Question generated!")
+                
+            except Exception as e:
+                st.error(f"Error generating question: {e}")
+                st.stop()
+    
+    # Display question
+    if 'question' in st.session_state:
+        q = st.session_state.question
         
-        if st.session_state.get('generate', False):
-            with st.spinner("🎨 Crafting your question..."):
-                try:
-                    # Generate question
-                    question = generator.generate(
-                        variation=variation,
-                        difficulty=difficulty,
-                        context_id=context_id,
-                        level=level
-                    )
-                    
-                    # Store in session
-                    st.session_state.question = question
-                    st.session_state.generate = False
-                    
-                    st.success("✅ Question generated!")
-                    
-                except Exception as e:
-                    st.error(f"Error generating question: {e}")
-                    st.stop()
+        # Context info
+        st.markdown('<div class="context-box">', unsafe_allow_html=True)
+        st.markdown(f"**Context:** {q.given_data['context_id']}")
+        st.markdown(f"**Level:** {q.given_data['level'].title()}")
+        st.markdown(f"**Variation:** {VARIATION_NAMES[q.given_data['variation']]}")
+        st.markdown(f"**Difficulty:** {q.difficulty}/5")
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Question text
+        st.markdown('<div class="question-box">', unsafe_allow_html=True)
+        st.markdown("### Question")
+        st.write(q.question_text)
+        st.markdown(f"**[{q.total_marks} mark{'s' if q.total_marks != 1 else ''}]**")
+        st.markdown('</div>', unsafe_allow_html=True)
         
-        # Display question
-        if 'question' in st.session_state:
-            q = st.session_state.question
+        # Show answer toggle
+        show_answer = st.checkbox("👁️ Show Answer & Solution", value=False)
+        
+        if show_answer:
+            st.markdown('<div class="answer-box">', unsafe_allow_html=True)
+            st.markdown("### ✅ Answer")
+            st.markdown(f"**{q.answer}**")
             
-            # Context info
-            st.markdown('<div class="context-box">', unsafe_allow_html=True)
-            st.markdown(f"**Context:** {q.given_data['context_id']}")
-            st.markdown(f"**Level:** {q.given_data['level'].title()}")
-            st.markdown(f"**Variation:** {q.given_data['variation'].replace('_', ' ').title()}")
-            st.markdown(f"**Difficulty:** {q.difficulty}/5")
-            st.markdown('</div>', unsafe_allow_html=True)
+            if q.solution_steps:
+                st.markdown("### 📝 Solution Steps")
+                for i, step in enumerate(q.solution_steps, 1):
+                    st.text(f"{i}. {step}")
             
-            # Question text
-            st.markdown('<div class="question-box">', unsafe_allow_html=True)
-            st.markdown("### Question")
-            st.write(q.question_text)
-            st.markdown(f"**[{q.total_marks} mark{'s' if q.total_marks != 1 else ''}]**")
             st.markdown('</div>', unsafe_allow_html=True)
-            
-            # Show answer toggle
-            show_answer = st.checkbox("👁️ Show Answer & Solution", value=False)
-            
-            if show_answer:
-                st.markdown('<div class="answer-box">', unsafe_allow_html=True)
-                st.markdown("### ✅ Answer")
-                st.markdown(f"**{q.answer}**")
-                
-                if q.solution_steps:
-                    st.markdown("### 📝 Solution Steps")
-                    for i, step in enumerate(q.solution_steps, 1):
-                        st.text(f"{i}. {step}")
-                
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            # Regenerate options
-            st.markdown("---")
-            col_a, col_b, col_c = st.columns(3)
-            
-            with col_a:
-                if st.button("🔄 Same context, new data"):
-                    st.session_state.generate = True
-                    st.rerun()
-            
-            with col_b:
-                if st.button("🎲 Random context"):
-                    context_id = None
-                    st.session_state.generate = True
-                    st.rerun()
-            
-            with col_c:
-                if st.button("📊 Change variation"):
-                    st.session_state.generate = False
-                    st.rerun()
         
-        else:
-            # Welcome message
-            st.info("👈 Configure your question in the sidebar, then click **Generate Question**")
-            
-            st.markdown("### 🌟 What is the Context Engine?")
-            st.write("""
-            The Context Engine generates mathematics questions with **rich, engaging narratives** 
-            using **50 different real-world contexts** across 13 categories.
-            
-            **Same math concept**, but presented in contexts students actually care about:
-            - 📱 Digital (file sizes, download speeds)
-            - 🏃 Fitness (heart rate, calories)
-            - 🎵 Music (song duration, tempo)
-            - 🚗 Transportation (commute time, speed)
-            - 🏠 Household (bills, cooking time)
-            - And many more!
-            """)
-            
-            st.markdown("### ✨ Features")
-            st.write("""
-            - **50 Contexts** - From server tips to heart rate to file sizes
-            - **3 Narrative Levels** - Minimal, standard, or rich storytelling
-            - **4 Variations** - Calculate, find missing value, compare, and more
-            - **Smart Compatibility** - Only generates questions that make sense
-            - **Realistic Values** - Context-appropriate number ranges
-            - **Automatic Units** - Proper formatting ($, %, °C, bpm, etc.)
-            """)
-
-    with col2:
-        st.header("📚 Examples")
+        # Regenerate options
+        st.markdown("---")
+        col_a, col_b, col_c = st.columns(3)
         
-        # Show example questions
-        examples = [
-            {
-                "title": "💰 Server Tips (Minimal)",
-                "text": "Ms. Lee works as a server. Tips over 5 days: $45, $52, $48, $50, $55. Calculate the mean.",
-                "answer": "$50.00"
-            },
-            {
-                "title": "❤️ Heart Rate (Rich)",
-                "text": "Dr. Singh works as a sports medicine specialist. She is evaluating an athlete's cardiovascular fitness...",
-                "answer": "Detailed scenario with exercise stages"
-            },
-            {
-                "title": "📁 File Sizes (Standard)",
-                "text": "Project file sizes recorded: 145MB, 203MB, 178MB, 195MB, 220MB. Calculate the mean file size.",
-                "answer": "188.2 MB"
-            },
-            {
-                "title": "🎵 Music Tempo",
-                "text": "A DJ tracked BPM for songs: 120 bpm, 128 bpm, 115 bpm, 132 bpm, 125 bpm",
-                "answer": "124.0 bpm"
-            }
-        ]
+        # Callbacks update state before the script runs, so a click needs no extra rerun
+        with col_a:
+            st.button("🔄 Same context, new data", on_click=_request_question)
         
-        for example in examples:
-            with st.expander(example["title"]):
-                st.write(example["text"])
-                st.caption(f"Answer: {example['answer']}")
+        with col_b:
+            st.button("🎲 Random context", on_click=_request_question, kwargs={'random_context': True})
         
-        st.markdown("---")
+        with col_c:
+            st.button("📊 Change variation", on_click=_cancel_question)
+    
+    else:
+        # Welcome message
+        st.info("👈 Configure your question in the sidebar, then click **Generate Question**")
         
-        st.header("🎯 Context Categories")
+        st.markdown("### 🌟 What is the Context Engine?")
+        st.write("""
+        The Context Engine generates mathematics questions with **rich, engaging narratives** 
+        using **50 different real-world contexts** across 13 categories.
         
-        categories_info = {
-            "Physical": "Lengths, areas, volumes, masses",
-            "Recreation": "Running, cycling, music, playlists",
-            "Health": "Heart rate, calories, blood pressure",
-            "Transportation": "Speeds, distances, commute times",
-            "Household": "Cooking, utilities, groceries",
-            "Academic": "Test scores, attendance, grades",
-            "Environmental": "Temperature, rainfall, snowfall",
-            "Digital": "File sizes, download speeds, data",
-            "Earnings": "Tips, wages",
-            "Financial": "Home prices, bills"
-        }
+        **Same math concept**, but presented in contexts students actually care about:
+        - 📱 Digital (file sizes, download speeds)
+        - 🏃 Fitness (heart rate, calories)
+        - 🎵 Music (song duration, tempo)
+        - 🚗 Transportation (commute time, speed)
+        - 🏠 Household (bills, cooking time)
+        - And many more!
+        """)
         
-        for category, description in categories_info.items():
-            st.markdown(f"**{category}**")
-            st.caption(description)
+        st.markdown("### ✨ Features")
+        st.write("""
+        - **50 Contexts** - From server tips to heart rate to file sizes
+        - **3 Narrative Levels** - Minimal, standard, or rich storytelling
+        - **4 Variations** - Calculate, find missing value, compare, and more
+        - **Smart Compatibility** - Only generates questions that make sense
+        - **Realistic Values** - Context-appropriate number ranges
+        - **Automatic Units** - Proper formatting ($, %, °C, bpm, etc.)
+        """)
+
+@st.fragment
+def render_examples_panel():
+    """Example questions and context category reference"""
+    st.header("📚 Examples")
+    
+    # Show example questions
+    for example in EXAMPLES:
+        with st.expander(example["title"]):
+            st.write(example["text"])
+            st.caption(f"Answer: {example['answer']}")
+    
+    st.markdown("---")
+    
+    st.header("🎯 Context Categories")
+    
+    for category, description in CATEGORIES_INFO.items():
+        st.markdown(f"**{category}**")
+        st.caption(description)
+
+def render_single_mode():
+    """Single question mode: sidebar generator, question panel and examples"""
+    variation, context_id, level, difficulty = render_single_sidebar()
+    
+    # Main content
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        render_question_panel(variation, context_id, level, difficulty)
+
+    with col2:
+        render_examples_panel()
 
 # =======================
 # PDF GENERATION MODE
 # =======================
-else:
-    with st.sidebar:
-        st.header("📄 PDF Generation")
-        
-        # STEP 1: Assessment Type
-        st.subheader("1️⃣ Assessment Type")
-        assessment_type = st.selectbox(
-            "What type of assessment?",
-            ["practice", "worksheet", "quiz", "test"],
-            format_func=lambda x: {
-                "practice": "📝 Practice Page",
-                "worksheet": "📋 Worksheet",
-                "quiz": "📊 Quiz",
-                "test": "📖 Test"
-            }[x],
-            help={
-                "practice": "Single skill, focused practice",
-                "worksheet": "Multiple skills, mixed practice",
-                "quiz": "Progressive difficulty assessment",
-                "test": "Comprehensive assessment"
-            }[assessment_type] if 'assessment_type' in locals() else "Choose assessment type"
-        )
-        
-        # Store in session state
-        if 'prev_assessment_type' not in st.session_state or st.session_state.prev_assessment_type != assessment_type:
-            st.session_state.prev_assessment_type = assessment_type
-            # Reset selections when type changes
-            if 'selected_variations' in st.session_state:
-                del st.session_state.selected_variations
-            if 'selected_categories' in st.session_state:
-                del st.session_state.selected_categories
-            if 'selected_contexts' in st.session_state:
-                del st.session_state.selected_contexts
-        
-        st.markdown("---")
-        
-        # STEP 2: Question Types (Variations)
-        st.subheader("2️⃣ Question Types")
+def _pack(q, difficulty):
+    """Question -> dict consumed by the PDF builders"""
+    return {
+        'question': q.question_text,
+        'answer': q.answer,
+        'steps': q.solution_steps,
+        'difficulty': DIFF_LABELS[difficulty]
+    }
+
+def _skill_sections(specs, questions):
+    """Group generated questions into one section per context, keeping spec order"""
+    skill_sections = []
+    for spec, q in zip(specs, questions):
+        context_id = spec['context_id']
+        if not skill_sections or skill_sections[-1][0] != context_id:
+            skill_sections.append((context_id, []))
+        skill_sections[-1][1].append(_pack(q, spec['difficulty']))
+    return [
+        {'skill_name': meta_table[context_id]['ContextName'], 'questions': section_questions}
+        for context_id, section_questions in skill_sections
+    ]
+
+# Session state the PDF sidebar needs before its widgets render. Category and
+# context selections default to "all available", which depends on earlier steps.
+SIDEBAR_DEFAULTS = {
+    'prev_assessment_type': None,
+    'selected_variations': ["calculate"],
+}
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def render_pdf_bytes(assessment_type, title, content, answer_key_type):
+    """PDF bytes for the given question content; an identical request reuses the cached build"""
+    # Each builder takes (title, questions/sections, answer_key_type)
+    build = getattr(pdf_generator, ASSESSMENTS[assessment_type].pdf_builder)
+    return build(title, content, answer_key_type=answer_key_type, return_bytes=True)
+
+def variation_multiselect(label, key, default=("calculate",), max_selections=None):
+    """Variation picker shared by the worksheet, quiz and test settings"""
+    return st.multiselect(
+        label,
+        VARIATIONS,
+        default=list(default),
+        format_func=VARIATION_LABELS.__getitem__,
+        max_selections=max_selections,
+        key=key
+    )
+
+def _select_all_variations():
+    """Select All button callback for question types"""
+    st.session_state.selected_variations = list(VARIATION_LABELS)
+
+def _select_all_categories(available_categories):
+    """All button callback for categories"""
+    st.session_state.selected_categories = available_categories
+
+def _select_all_contexts(context_ids):
+    """All button callback for contexts; clears the editor's row edits too"""
+    st.session_state.selected_contexts = context_ids
+    st.session_state.pop('ctx_editor', None)
+
+@st.fragment
+def render_pdf_sidebar():
+    """PDF settings sidebar; widget changes rerun only this fragment until Generate PDF"""
+    for key, value in SIDEBAR_DEFAULTS.items():
+        st.session_state.setdefault(key, value)
+    
+    st.header("📄 PDF Generation")
+    
+    # STEP 1: Assessment Type
+    st.subheader("1️⃣ Assessment Type")
+    assessment_type = st.selectbox(
+        "What type of assessment?",
+        list(ASSESSMENT_LABELS),
+        format_func=ASSESSMENT_LABELS.__getitem__,
+        help="Choose assessment type"
+    )
+    spec = ASSESSMENTS[assessment_type]
+    
+    # Store in session state
+    if st.session_state.prev_assessment_type != assessment_type:
+        st.session_state.prev_assessment_type = assessment_type
+        # Reset selections when type changes
+        st.session_state.selected_variations = SIDEBAR_DEFAULTS['selected_variations']
+        st.session_state.pop('selected_categories', None)
+        st.session_state.pop('selected_contexts', None)
+    
+    st.markdown("---")
+    
+    # STEP 2: Question Types (Variations)
+    st.subheader("2️⃣ Question Types")
+    
+    col_select_all = st.columns([3, 1])
+    with col_select_all[1]:
+        st.button("Select All", key="select_all_variations", use_container_width=True,
+                  on_click=_select_all_variations)
+    
+    previous_variations = frozenset(st.session_state.selected_variations)
+    selected_variations = []
+    for var_key, var_label in VARIATION_LABELS.items():
+        if st.checkbox(
+            var_label, 
+            value=var_key in previous_variations,
+            key=f"var_{var_key}"
+        ):
+            selected_variations.append(var_key)
+    
+    st.session_state.selected_variations = selected_variations if selected_variations else ["calculate"]
+    
+    st.markdown("---")
+    
+    # STEP 3: Categories (only show if variations selected)
+    if selected_variations:
+        st.subheader("3️⃣ Categories")
         
-        col_select_all = st.columns([3, 1])
-        with col_select_all[1]:
-            if st.button("Select All", key="select_all_variations", use_container_width=True):
-                st.session_state.selected_variations = ["calculate", "missing_value", "compare", "missing_count"]
-                st.rerun()
+        # Contexts compatible with any selected variation, and their categories
+        ctx_df = context_table(data_version)
+        compatible_df = ctx_df[ctx_df[selected_variations].any(axis=1)]
+        available_categories = sorted(compatible_df['category'].unique())
         
-        if 'selected_variations' not in st.session_state:
-            st.session_state.selected_variations = ["calculate"]
+        col_select_all_cat = st.columns([3, 1])
+        with col_select_all_cat[1]:
+            st.button("All", key="select_all_categories", use_container_width=True,
+                      on_click=_select_all_categories, args=(available_categories,))
         
-        variation_options = {
-            "calculate": "📊 Calculate Mean",
-            "missing_value": "🎯 Find Missing Value",
-            "compare": "⚖️ Compare Means",
-            "missing_count": "🔢 Find Number of Values"
-        }
+        st.session_state.setdefault('selected_categories', available_categories)  # Default to ALL
         
-        selected_variations = []
-        for var_key, var_label in variation_options.items():
+        previous_categories = frozenset(st.session_state.selected_categories)
+        selected_categories = []
+        for category in available_categories:
             if st.checkbox(
-                var_label, 
-                value=var_key in st.session_state.selected_variations,
-                key=f"var_{var_key}"
+                category, 
+                value=category in previous_categories,
+                key=f"cat_{category}"
             ):
-                selected_variations.append(var_key)
+                selected_categories.append(category)
         
-        st.session_state.selected_variations = selected_variations if selected_variations else ["calculate"]
+        st.session_state.selected_categories = selected_categories if selected_categories else available_categories
         
         st.markdown("---")
         
-        # STEP 3: Categories (only show if variations selected)
-        if selected_variations:
-            st.subheader("3️⃣ Categories")
+        # STEP 4: Specific Contexts (only show if categories selected)
+        if selected_categories:
+            st.subheader("4️⃣ Contexts")
             
-            # Get all compatible contexts for selected variations
-            all_compatible = set()
-            for var in selected_variations:
-                all_compatible.update(generator.engine.get_compatible_contexts(var))
+            contexts_in_categories = compute_contexts(data_version, frozenset(selected_variations), frozenset(selected_categories))
             
-            # Get unique categories from compatible contexts
-            available_categories = set()
-            for ctx_id in all_compatible:
-                meta = generator.engine.get_context_metadata(ctx_id)
-                available_categories.add(meta['Category'])
+            context_ids = [c[0] for c in contexts_in_categories]
             
-            available_categories = sorted(available_categories)
+            # The editor stores edits by row position, so drop them when the rows change
+            if st.session_state.get('ctx_editor_ids') != context_ids:
+                st.session_state.ctx_editor_ids = context_ids
+                st.session_state.pop('ctx_editor', None)
             
-            col_select_all_cat = st.columns([3, 1])
-            with col_select_all_cat[1]:
-                if st.button("All", key="select_all_categories", use_container_width=True):
-                    st.session_state.selected_categories = available_categories
-                    st.rerun()
+            col_select_all_ctx = st.columns([3, 1])
+            with col_select_all_ctx[1]:
+                st.button("All", key="select_all_contexts", use_container_width=True,
+                          on_click=_select_all_contexts, args=(context_ids,))
             
-            if 'selected_categories' not in st.session_state:
-                st.session_state.selected_categories = available_categories  # Default to ALL
+            st.session_state.setdefault('selected_contexts', context_ids)  # Default to ALL
             
-            selected_categories = []
-            for category in available_categories:
-                if st.checkbox(
-                    category, 
-                    value=category in st.session_state.selected_categories,
-                    key=f"cat_{category}"
-                ):
-                    selected_categories.append(category)
+            # Group by category for display
+            st.write(f"**{len(contexts_in_categories)} contexts available:**")
+            
+            with st.expander("Select specific contexts", expanded=False):
+                # One editor widget instead of a checkbox per context
+                previous_contexts = frozenset(st.session_state.selected_contexts)
+                contexts_df = pd.DataFrame({
+                    'Selected': [ctx_id in previous_contexts for ctx_id in context_ids],
+                    'Category': [c[2] for c in contexts_in_categories],
+                    'Context': [c[1] for c in contexts_in_categories],
+                })
+                edited = st.data_editor(
+                    contexts_df,
+                    disabled=['Category', 'Context'],
+                    hide_index=True,
+                    use_container_width=True,
+                    key="ctx_editor"
+                )
+                selected_contexts = [ctx_id for ctx_id, selected in zip(context_ids, edited['Selected']) if selected]
+                
+                st.session_state.selected_contexts = selected_contexts if selected_contexts else context_ids
             
-            st.session_state.selected_categories = selected_categories if selected_categories else available_categories
+            # Show count
+            st.info(f"✅ **{len(st.session_state.selected_contexts)} contexts** selected")
             
             st.markdown("---")
             
-            # STEP 4: Specific Contexts (only show if categories selected)
-            if selected_categories:
-                st.subheader("4️⃣ Contexts")
-                
-                # Filter contexts by selected categories
-                contexts_in_categories = []
-                for ctx_id in all_compatible:
-                    meta = generator.engine.get_context_metadata(ctx_id)
-                    if meta['Category'] in selected_categories:
-                        contexts_in_categories.append((ctx_id, meta['ContextName'], meta['Category']))
-                
-                # Sort by category, then name
-                contexts_in_categories.sort(key=lambda x: (x[2], x[1]))
-                
-                col_select_all_ctx = st.columns([3, 1])
-                with col_select_all_ctx[1]:
-                    if st.button("All", key="select_all_contexts", use_container_width=True):
-                        st.session_state.selected_contexts = [c[0] for c in contexts_in_categories]
-                        st.rerun()
-                
-                if 'selected_contexts' not in st.session_state:
-                    st.session_state.selected_contexts = [c[0] for c in contexts_in_categories]  # Default to ALL
-                
-                # Group by category for display
-                st.write(f"**{len(contexts_in_categories)} contexts available:**")
-                
-                with st.expander("Select specific contexts", expanded=False):
-                    selected_contexts = []
-                    
-                    current_category = None
-                    for ctx_id, ctx_name, category in contexts_in_categories:
-                        # Show category header
-                        if category != current_category:
-                            if current_category is not None:
-                                st.markdown("---")
-                            st.markdown(f"**{category}**")
-                            current_category = category
-                        
-                        if st.checkbox(
-                            ctx_name,
-                            value=ctx_id in st.session_state.selected_contexts,
-                            key=f"ctx_{ctx_id}"
-                        ):
-                            selected_contexts.append(ctx_id)
-                    
-                    st.session_state.selected_contexts = selected_contexts if selected_contexts else [c[0] for c in contexts_in_categories]
-                
-                # Show count
-                st.info(f"✅ **{len(st.session_state.selected_contexts)} contexts** selected")
-                
-                st.markdown("---")
-                
+            # Steps 5-6 only feed the generated PDF, so collect them in a form and
+            # send them with the Generate PDF submit instead of rerunning per slider move
+            with st.form("pdf_config", border=False):
                 # STEP 5: Question Settings
                 st.subheader("5️⃣ Question Settings")
                 
-                if assessment_type == "practice":
-                    num_questions = st.slider("Questions", 3, 15, 5, key="practice_num")
-                    difficulty = st.slider("Difficulty", 1, 5, 2, key="practice_diff")
-                elif assessment_type == "worksheet":
-                    num_questions_per = st.slider("Questions per context", 2, 8, 3, key="worksheet_num")
-                    difficulty = st.slider("Difficulty", 1, 5, 2, key="worksheet_diff")
-                elif assessment_type == "quiz":
-                    num_questions_per = st.slider("Questions per context", 2, 5, 3, key="quiz_num")
-                    st.info("💡 Difficulty will progress Easy → Medium → Hard")
-                    difficulty = None
-                else:  # test
-                    num_questions_total = st.slider("Total questions", 10, 30, 15, key="test_num")
-                    st.info("💡 Difficulty will progress across all questions")
+                num_questions = st.slider(spec.form_count_label, *spec.count_range, key=f"{assessment_type}_num")
+                if spec.progressive:
+                    st.info(spec.progress_note)
                     difficulty = None
+                else:
+                    difficulty = st.slider("Difficulty", 1, 5, 2, key=f"{assessment_type}_diff")
                 
                 st.markdown("---")
                 
@@ -584,15 +627,11 @@ else:
                 st.subheader("6️⃣ Answer Key")
                 answer_key_option = st.radio(
                     "Include answer key?",
-                    ["No answer key", "Answers only", "Full solutions with steps"],
+                    tuple(ANSWER_KEY_TYPES),
                     key="pdf_answer_key"  # Unique key for PDF mode
                 )
                 
-                answer_key_type = {
-                    "No answer key": None,
-                    "Answers only": "answers_only",
-                    "Full solutions with steps": "with_steps"
-                }[answer_key_option]
+                answer_key_type = ANSWER_KEY_TYPES[answer_key_option]
                 
                 st.markdown("---")
                 
@@ -602,557 +641,481 @@ else:
                 if not can_generate:
                     st.warning("⚠️ Select at least 1 context and 1 question type")
                 
-                if st.button("📄 Generate PDF", type="primary", use_container_width=True, disabled=not can_generate, key="generate_pdf_button"):
+                if st.form_submit_button("📄 Generate PDF", type="primary", use_container_width=True, disabled=not can_generate):
                     st.session_state.generate_pdf = True
                     
                     # Store settings for PDF generation
-                    st.session_state.pdf_settings = {
-                        'assessment_type': assessment_type,
-                        'selected_variations': selected_variations,
-                        'selected_contexts': st.session_state.selected_contexts[:],
-                        'answer_key_type': answer_key_type,
-                        'answer_key_option': answer_key_option,
-                        'num_questions': num_questions if assessment_type == "practice" else None,
-                        'num_questions_per': num_questions_per if assessment_type in ["worksheet", "quiz"] else None,
-                        'num_questions_total': num_questions_total if assessment_type == "test" else None,
-                        'difficulty': difficulty
-                    }
-        
-        # Show stats
-        st.markdown("---")
-        st.subheader("📊 Summary")
-        st.metric("Question Types", len(selected_variations) if selected_variations else 0)
-        st.metric("Categories", len(st.session_state.get('selected_categories', [])))
-        st.metric("Contexts", len(st.session_state.get('selected_contexts', [])))
-        
-        if assessment_type == "practice":
-            # Variation selector first
-            st.write("**Variation:**")
-            selected_variation = st.selectbox(
-                "Question type",
-                ["calculate", "missing_value", "compare", "missing_count"],
-                format_func=lambda x: {
-                    "calculate": "📊 Calculate Mean",
-                    "missing_value": "🎯 Find Missing Value",
-                    "compare": "⚖️ Compare Means",
-                    "missing_count": "🔢 Find Number of Values"
-                }[x],
-                key="practice_variation"
-            )
-            
-            # Single context for practice
-            st.write("**Context:**")
-            # Get only compatible contexts for this variation
-            compatible_contexts = generator.engine.get_compatible_contexts(selected_variation)
-            
-            # Group by category
-            context_by_category = {}
-            for ctx_id in compatible_contexts:
-                meta = generator.engine.get_context_metadata(ctx_id)
-                category = meta['Category']
-                if category not in context_by_category:
-                    context_by_category[category] = []
-                context_by_category[category].append((ctx_id, meta['ContextName']))
-            
-            categories = sorted(context_by_category.keys())
-            category = st.selectbox("Category", categories, key="pdf_category")
-            
-            contexts_in_category = context_by_category[category]
-            context_choice = st.selectbox(
-                "Context",
-                contexts_in_category,
-                format_func=lambda x: x[1],
-                key="pdf_context"
-            )
-            selected_contexts = [context_choice[0]]
-            
-            num_questions = st.slider("Number of questions", 3, 15, 5)
-            
-        elif assessment_type == "worksheet":
-            # Variation selector
-            st.write("**Variations to include:**")
-            available_variations = ["calculate", "missing_value", "compare", "missing_count"]
-            selected_variations = st.multiselect(
-                "Select 1-4 variations",
-                available_variations,
-                default=["calculate"],
-                format_func=lambda x: {
-                    "calculate": "📊 Calculate Mean",
-                    "missing_value": "🎯 Find Missing Value",
-                    "compare": "⚖️ Compare Means",
-                    "missing_count": "🔢 Find Number of Values"
-                }[x],
-                max_selections=4,
-                key="worksheet_variations"
-            )
-            
-            if not selected_variations:
-                st.warning("Please select at least one variation")
-                selected_contexts = []
-            else:
-                # Multiple contexts
-                st.write("**Select 2-4 Skills:**")
-                # Get contexts compatible with ANY of the selected variations
-                all_compatible = set()
-                for var in selected_variations:
-                    all_compatible.update(generator.engine.get_compatible_contexts(var))
-                all_contexts = list(all_compatible)
-                
-                # Simplified: just show all contexts
-                available = [(ctx, generator.engine.get_context_metadata(ctx)['ContextName']) 
-                            for ctx in all_contexts]
-                
-                selected = st.multiselect(
-                    "Contexts",
-                    available,
-                    format_func=lambda x: x[1],
-                    max_selections=4,
-                    key="worksheet_contexts"
-                )
-                
-                selected_contexts = [s[0] for s in selected] if selected else []
-            
-            num_questions_per = st.slider("Questions per skill", 2, 8, 3)
-            
-        elif assessment_type == "quiz":
-            # Variation selector
-            st.write("**Variations to include:**")
-            available_variations = ["calculate", "missing_value", "compare", "missing_count"]
-            selected_variations = st.multiselect(
-                "Select 1-3 variations",
-                available_variations,
-                default=["calculate"],
-                format_func=lambda x: {
-                    "calculate": "📊 Calculate Mean",
-                    "missing_value": "🎯 Find Missing Value",
-                    "compare": "⚖️ Compare Means",
-                    "missing_count": "🔢 Find Number of Values"
-                }[x],
-                max_selections=3,
-                key="quiz_variations"
-            )
-            
-            if not selected_variations:
-                st.warning("Please select at least one variation")
-                selected_contexts = []
-            else:
-                # 2-3 contexts with difficulty progression
-                st.write("**Select 2-3 Skills:**")
-                # Get contexts compatible with ANY of the selected variations
-                all_compatible = set()
-                for var in selected_variations:
-                    all_compatible.update(generator.engine.get_compatible_contexts(var))
-                all_contexts = list(all_compatible)
-                
-                available = [(ctx, generator.engine.get_context_metadata(ctx)['ContextName']) 
-                            for ctx in all_contexts]
-                
-                selected = st.multiselect(
-                    "Contexts",
-                    available,
-                    format_func=lambda x: x[1],
-                    max_selections=3,
-                    key="quiz_contexts"
-                )
-                
-                selected_contexts = [s[0] for s in selected] if selected else []
-            
-            num_questions_per = st.slider("Questions per skill", 2, 5, 3)
-            
-        else:  # test
-            # All available contexts
-            st.write("**Variations to include:**")
-            available_variations = ["calculate", "missing_value", "compare", "missing_count"]
-            selected_variations = st.multiselect(
-                "Select variations for test",
-                available_variations,
-                default=["calculate", "missing_value"],
-                format_func=lambda x: {
-                    "calculate": "📊 Calculate Mean",
-                    "missing_value": "🎯 Find Missing Value",
-                    "compare": "⚖️ Compare Means",
-                    "missing_count": "🔢 Find Number of Values"
-                }[x],
-                key="test_variations"
-            )
-            
-            if not selected_variations:
-                st.warning("Please select at least one variation")
-                selected_contexts = []
-            else:
-                st.write("**Comprehensive test across compatible skills**")
-                # Get contexts compatible with ALL selected variations
-                if len(selected_variations) == 1:
-                    compatible_set = set(generator.engine.get_compatible_contexts(selected_variations[0]))
-                else:
-                    # Intersection: only contexts that support ALL variations
-                    compatible_set = set(generator.engine.get_compatible_contexts(selected_variations[0]))
-                    for var in selected_variations[1:]:
-                        compatible_set &= set(generator.engine.get_compatible_contexts(var))
-                
-                selected_contexts = list(compatible_set)[:8]  # Limit to 8 contexts for tests
-                st.info(f"Using {len(selected_contexts)} contexts that support all selected variations")
-            
-            num_questions_total = st.slider("Total questions", 10, 30, 15)
+                    st.session_state.pdf_settings = PDFSettings(
+                        assessment_type=assessment_type,
+                        selected_variations=tuple(selected_variations),
+                        selected_contexts=tuple(st.session_state.selected_contexts),
+                        answer_key_type=answer_key_type,
+                        answer_key_option=answer_key_option,
+                        difficulty=difficulty,
+                        **{spec.count_field: num_questions}
+                    )
+                    st.rerun(scope="app")
+    
+    # Show stats
+    st.markdown("---")
+    st.subheader("📊 Summary")
+    st.metric("Question Types", len(selected_variations) if selected_variations else 0)
+    st.metric("Categories", len(st.session_state.get('selected_categories', [])))
+    st.metric("Contexts", len(st.session_state.get('selected_contexts', [])))
+    
+    if assessment_type == "practice":
+        # Variation selector first
+        st.write("**Variation:**")
+        selected_variation = st.selectbox(
+            "Question type",
+            VARIATIONS,
+            format_func=VARIATION_LABELS.__getitem__,
+            key="practice_variation"
+        )
         
-        st.subheader("3️⃣ Difficulty")
-        if assessment_type in ["practice", "worksheet"]:
-            difficulty = st.slider("Difficulty level", 1, 5, 2, key="pdf_difficulty")
-        else:  # quiz or test - progressive
-            st.info("Difficulty will progress from Easy → Hard")
-            difficulty = None
+        # Single context for practice
+        st.write("**Context:**")
+        # Compatible contexts for this variation, grouped by category (cached)
+        categories, context_by_category = _grouped(data_version, selected_variation)
+        category = st.selectbox("Category", categories, key="pdf_category")
         
-        st.subheader("4️⃣ Answer Key")
-        answer_key_option = st.radio(
-            "Include answer key?",
-            ["No answer key", "Answers only", "Full solutions with steps"],
-            key="answer_key"
+        context_choice = st.selectbox(
+            "Context",
+            context_by_category[category],
+            format_func=_context_name,
+            key="pdf_context"
         )
+        selected_contexts = [context_choice]
         
-        answer_key_type = {
-            "No answer key": None,
-            "Answers only": "answers_only",
-            "Full solutions with steps": "with_steps"
-        }[answer_key_option]
+    elif assessment_type in ("worksheet", "quiz"):
+        # Variation selector
+        st.write("**Variations to include:**")
+        selected_variations = variation_multiselect(
+            f"Select 1-{spec.max_variations} variations",
+            f"{assessment_type}_variations",
+            max_selections=spec.max_variations
+        )
         
-        st.markdown("---")
+        if not selected_variations:
+            st.warning("Please select at least one variation")
+            selected_contexts = []
+        else:
+            # Multiple contexts
+            st.write(f"**Select {spec.min_contexts}-{spec.max_contexts} Skills:**")
+            # Get contexts compatible with ANY of the selected variations
+            # Simplified: just show all contexts, by name
+            all_contexts = _compat_union(data_version, tuple(sorted(selected_variations)))
+            
+            selected_contexts = st.multiselect(
+                "Contexts",
+                all_contexts,
+                format_func=_context_name,
+                max_selections=spec.max_contexts,
+                key=f"{assessment_type}_contexts"
+            )
         
-        # Generate PDF button
-        can_generate = False
-        if assessment_type == "practice":
-            can_generate = len(selected_contexts) == 1
-        elif assessment_type in ["worksheet", "quiz"]:
-            can_generate = len(selected_contexts) >= 2 and len(selected_variations) >= 1
-        elif assessment_type == "test":
-            can_generate = len(selected_contexts) >= 3 and len(selected_variations) >= 1
+    else:  # test
+        # All available contexts
+        st.write("**Variations to include:**")
+        selected_variations = variation_multiselect("Select variations for test", "test_variations", default=("calculate", "missing_value"))
         
-        if st.button("📄 Generate PDF", type="primary", use_container_width=True, disabled=not can_generate):
-            st.session_state.generate_pdf = True
+        if not selected_variations:
+            st.warning("Please select at least one variation")
+            selected_contexts = []
+        else:
+            st.write("**Comprehensive test across compatible skills**")
+            # Get contexts compatible with ALL selected variations (AND across the flag columns)
+            compatible_ids = _compat_intersection(data_version, tuple(sorted(selected_variations)))
+            
+            selected_contexts = compatible_ids[:spec.max_contexts]  # Limit the contexts for tests
+            st.info(f"Using {len(selected_contexts)} contexts that support all selected variations")
     
-    # Main content
-    st.header("PDF Assessment Generator")
+    num_questions = st.slider(spec.count_label, *spec.count_range)
     
-    if not can_generate:
-        st.warning("👈 Please configure the assessment settings in the sidebar")
-        
-        st.markdown("### 📄 PDF Assessment Types")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("#### 📝 Practice Page")
-            st.write("""
-            - **Single skill** focus
-            - 3-15 questions
-            - Same difficulty level
-            - Great for homework or classwork
-            """)
-            
-            st.markdown("#### 📊 Quiz")
-            st.write("""
-            - **2-3 skills**
-            - Progressive difficulty (Easy → Hard)
-            - 6-15 questions total
-            - Includes difficulty indicators
-            """)
+    st.subheader("3️⃣ Difficulty")
+    if spec.progressive:
+        st.info("Difficulty will progress from Easy → Hard")
+        difficulty = None
+    else:
+        difficulty = st.slider("Difficulty level", 1, 5, 2, key="pdf_difficulty")
+    
+    st.subheader("4️⃣ Answer Key")
+    answer_key_option = st.radio(
+        "Include answer key?",
+        tuple(ANSWER_KEY_TYPES),
+        key="answer_key"
+    )
+    
+    answer_key_type = ANSWER_KEY_TYPES[answer_key_option]
+    
+    st.markdown("---")
+    
+    # Generate PDF button
+    # (practice picks its single variation itself, so it needs no checked types)
+    can_generate = (
+        spec.min_contexts <= len(selected_contexts) <= (spec.max_contexts or len(selected_contexts))
+        and (spec.max_variations == 1 or len(selected_variations) >= 1)
+    )
+    
+    # Hand off to the main content, which only reruns with the whole app
+    st.session_state.pdf_can_generate = can_generate
+    
+    if st.button("📄 Generate PDF", type="primary", use_container_width=True, disabled=not can_generate):
+        st.session_state.generate_pdf = True
+        st.rerun(scope="app")
+
+def render_pdf_help():
+    """Assessment type overview shown until the sidebar settings are complete"""
+    st.warning("👈 Please configure the assessment settings in the sidebar")
+    
+    st.markdown("### 📄 PDF Assessment Types")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### 📝 Practice Page")
+        st.write("""
+        - **Single skill** focus
+        - 3-15 questions
+        - Same difficulty level
+        - Great for homework or classwork
+        """)
         
-        with col2:
-            st.markdown("#### 📋 Worksheet")
-            st.write("""
-            - **2-4 skills**
-            - Multiple questions per skill
-            - Mixed practice
-            - Great for review
-            """)
-            
-            st.markdown("#### 📖 Test")
-            st.write("""
-            - **Comprehensive** assessment
-            - Multiple skills
-            - Progressive difficulty
-            - 10-30 questions
-            """)
+        st.markdown("#### 📊 Quiz")
+        st.write("""
+        - **2-3 skills**
+        - Progressive difficulty (Easy → Hard)
+        - 6-15 questions total
+        - Includes difficulty indicators
+        """)
     
-    elif st.session_state.get('generate_pdf', False):
-        # Get settings from session state
-        settings = st.session_state.get('pdf_settings', {})
-        assessment_type = settings.get('assessment_type', 'practice')
-        selected_variations = settings.get('selected_variations', ['calculate'])
-        selected_contexts = settings.get('selected_contexts', [])
-        answer_key_type = settings.get('answer_key_type', None)
-        answer_key_option = settings.get('answer_key_option', 'No answer key')
+    with col2:
+        st.markdown("#### 📋 Worksheet")
+        st.write("""
+        - **2-4 skills**
+        - Multiple questions per skill
+        - Mixed practice
+        - Great for review
+        """)
         
-        with st.spinner("📄 Generating PDF assessment..."):
-            try:
-                # Generate questions
-                questions_for_pdf = []
+        st.markdown("#### 📖 Test")
+        st.write("""
+        - **Comprehensive** assessment
+        - Multiple skills
+        - Progressive difficulty
+        - 10-30 questions
+        """)
+
+@contextmanager
+def _phase(name):
+    """Time a build_pdf phase; (name, ms) pairs feed the Perf expander on the download panel"""
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter_ns() - start) / 1e6
+        st.session_state.setdefault('pdf_phases', []).append((name, elapsed_ms))
+
+def build_pdf():
+    """Generate the questions and PDF for the stashed settings (Generate PDF runs only)"""
+    # Get settings from session state
+    settings = st.session_state.get('pdf_settings') or PDFSettings()
+    assessment_type = settings.assessment_type
+    selected_variations = settings.selected_variations
+    selected_contexts = settings.selected_contexts
+    answer_key_type = settings.answer_key_type
+    
+    st.session_state.pdf_phases = []
+    
+    with st.spinner("📄 Generating PDF assessment..."):
+        try:
+            # Generate questions (one generate_many batch per assessment)
+            if assessment_type == "practice":
+                # Practice: use first context, rotate through variations
+                num_questions = settings.num_questions
+                difficulty = settings.difficulty
                 
-                if assessment_type == "practice":
-                    # Practice: use first context, rotate through variations
-                    num_questions = settings.get('num_questions', 5)
-                    difficulty = settings.get('difficulty', 2)
-                    
-                    for i in range(num_questions):
-                        context_id = selected_contexts[i % len(selected_contexts)]
-                        variation = selected_variations[i % len(selected_variations)]
-                        
-                        q = generator.generate(
-                            variation=variation,
-                            difficulty=difficulty,
-                            context_id=context_id,
-                            level="standard"
-                        )
-                        questions_for_pdf.append({
-                            'question': q.question_text,
-                            'answer': q.answer,
-                            'steps': q.solution_steps,
-                            'difficulty': 'Easy' if difficulty <= 2 else 'Medium' if difficulty <= 3 else 'Hard'
-                        })
-                    
-                    # Generate PDF
-                    variation_names = ", ".join([v.replace('_', ' ').title() for v in selected_variations])
-                    
-                    # Debug: Check if we have questions
-                    if not questions_for_pdf:
-                        st.error(f"No questions were generated! Check your selections.")
-                        st.stop()
-                    
-                    st.info(f"Generated {len(questions_for_pdf)} questions")
-                    
-                    # Debug: Show first question preview
-                    with st.expander("Preview first question"):
-                        st.write(questions_for_pdf[0])
-                    
-                    filename = pdf_generator.create_practice_page(
-                        skill_name=f"Mean Calculations - {variation_names}",
-                        questions=questions_for_pdf,
-                        answer_key_type=answer_key_type
-                    )
-                    
-                elif assessment_type == "worksheet":
-                    # Multiple contexts, rotate through variations
-                    num_questions_per = settings.get('num_questions_per', 3)
-                    difficulty = settings.get('difficulty', 2)
-                    skill_sections = []
-                    
-                    for context_id in selected_contexts:
-                        section_questions = []
-                        
-                        # Rotate through selected variations for each context
-                        for i in range(num_questions_per):
-                            variation = selected_variations[i % len(selected_variations)]
-                            
-                            # Check if this context supports this variation
-                            compatible = generator.engine.get_compatible_contexts(variation)
-                            if context_id not in compatible:
-                                continue
-                            
-                            q = generator.generate(
-                                variation=variation,
-                                difficulty=difficulty,
-                                context_id=context_id,
-                                level="standard"
-                            )
-                            section_questions.append({
-                                'question': q.question_text,
-                                'answer': q.answer,
-                                'steps': q.solution_steps,
-                                'difficulty': 'Easy' if difficulty <= 2 else 'Medium' if difficulty <= 3 else 'Hard'
-                            })
-                        
-                        if section_questions:
-                            meta = generator.engine.get_context_metadata(context_id)
-                            skill_sections.append({
-                                'skill_name': meta['ContextName'],
-                                'questions': section_questions
-                            })
-                    
-                    if not skill_sections:
-                        st.error("No questions were generated! Check your selections.")
-                        st.stop()
-                    
-                    st.info(f"Generated {len(skill_sections)} sections with {sum(len(s['questions']) for s in skill_sections)} total questions")
-                    
-                    filename = pdf_generator.create_worksheet(
-                        title="Mean Calculation Worksheet",
-                        skill_sections=skill_sections,
-                        answer_key_type=answer_key_type
-                    )
+                specs = [
+                    {
+                        'variation': selected_variations[i % len(selected_variations)],
+                        'difficulty': difficulty,
+                        'context_id': selected_contexts[i % len(selected_contexts)],
+                        'level': "standard"
+                    }
+                    for i in range(num_questions)
+                ]
+                with _phase("generate"):
+                    questions = generator.generate_many(specs)
+                questions_for_pdf = [_pack(q, difficulty) for q in questions]
                 
-                elif assessment_type == "quiz":
-                    # Progressive difficulty with selected variations
-                    num_questions_per = settings.get('num_questions_per', 3)
-                    skill_sections = []
-                    difficulties = [1, 2, 3]  # Easy, Medium, Hard
-                    
-                    for context_id in selected_contexts:
-                        section_questions = []
-                        
-                        for i, diff in enumerate(difficulties[:num_questions_per]):
-                            # Rotate through selected variations
-                            variation = selected_variations[i % len(selected_variations)]
-                            
-                            # Check compatibility
-                            compatible = generator.engine.get_compatible_contexts(variation)
-                            if context_id not in compatible:
-                                continue
-                            
-                            q = generator.generate(
-                                variation=variation,
-                                difficulty=diff,
-                                context_id=context_id,
-                                level="standard"
-                            )
-                            section_questions.append({
-                                'question': q.question_text,
-                                'answer': q.answer,
-                                'steps': q.solution_steps,
-                                'difficulty': 'Easy' if diff <= 2 else 'Medium' if diff <= 3 else 'Hard'
-                            })
-                        
-                        if section_questions:
-                            meta = generator.engine.get_context_metadata(context_id)
-                            skill_sections.append({
-                                'skill_name': meta['ContextName'],
-                                'questions': section_questions
-                            })
-                    
-                    if not skill_sections:
-                        st.error("No questions were generated! Check your selections.")
-                        st.stop()
-                    
-                    st.info(f"Generated {len(skill_sections)} sections with {sum(len(s['questions']) for s in skill_sections)} total questions")
-                    
-                    filename = pdf_generator.create_quiz(
-                        title="Mean Calculation Quiz",
-                        skill_sections=skill_sections,
-                        answer_key_type=answer_key_type
-                    )
+                # Generate PDF
+                variation_names = ", ".join(VARIATION_NAMES[v] for v in selected_variations)
                 
-                else:  # test
-                    # Comprehensive test with selected variations
-                    num_questions_total = settings.get('num_questions_total', 15)
-                    all_questions = []
-                    difficulties = [1, 1, 2, 2, 3, 3, 4, 4, 5, 5] * 3  # Progressive
-                    
-                    questions_per_context = num_questions_total // len(selected_contexts) if selected_contexts else 0
-                    
-                    for context_id in selected_contexts:
-                        for i in range(questions_per_context):
-                            # Rotate through variations
-                            variation = selected_variations[i % len(selected_variations)]
-                            diff = difficulties[i % len(difficulties)]
-                            
-                            q = generator.generate(
-                                variation=variation,
-                                difficulty=diff,
-                                context_id=context_id,
-                                level="standard"
-                            )
-                            
-                            meta = generator.engine.get_context_metadata(context_id)
-                            all_questions.append({
-                                'question': q.question_text,
-                                'answer': q.answer,
-                                'steps': q.solution_steps,
-                                'difficulty': 'Easy' if diff <= 2 else 'Medium' if diff <= 3 else 'Hard',
-                                'skill_name': meta['ContextName']
-                            })
-                    
-                    # Sort by difficulty
-                    all_questions.sort(key=lambda x: ['Easy', 'Medium', 'Hard'].index(x['difficulty']))
-                    
-                    if not all_questions:
-                        st.error("No questions were generated! Check your selections.")
-                        st.stop()
-                    
-                    st.info(f"Generated {len(all_questions)} questions")
-                    
-                    filename = pdf_generator.create_test(
-                        title="Grade 12 Essential Mathematics - Mean Calculation Test",
-                        all_skills_questions=all_questions,
-                        answer_key_type=answer_key_type
+                # Debug: Check if we have questions
+                if not questions_for_pdf:
+                    st.error(f"No questions were generated! Check your selections.")
+                    st.stop()
+                
+                st.info(f"Generated {len(questions_for_pdf)} questions")
+                
+                # Debug: Show first question preview
+                with st.expander("Preview first question"):
+                    st.write(questions_for_pdf[0])
+                
+                with _phase("pdf"):
+                    pdf_bytes = render_pdf_bytes(
+                        "practice",
+                        f"Mean Calculations - {variation_names}",
+                        questions_for_pdf,
+                        answer_key_type
                     )
                 
-                st.session_state.generate_pdf = False
-                st.session_state.pdf_file = filename
+            elif assessment_type == "worksheet":
+                # Multiple contexts, rotate through variations
+                num_questions_per = settings.num_questions_per
+                difficulty = settings.difficulty
                 
-                # Don't rerun - let the download section appear below
+                # Every context rotates through the selected variations the same way;
+                # only the (context, variation) pairs the context supports become specs
+                schedule = [selected_variations[i % len(selected_variations)] for i in range(num_questions_per)]
+                compatible = variation_compat(data_version)
+                specs = [
+                    {
+                        'variation': variation,
+                        'difficulty': difficulty,
+                        'context_id': context_id,
+                        'level': "standard"
+                    }
+                    for context_id in selected_contexts
+                    for variation in schedule
+                    if context_id in compatible[variation]
+                ]
                 
-            except Exception as e:
-                st.error(f"Error generating PDF: {e}")
-                import traceback
-                st.code(traceback.format_exc())
-    
-    # Show download button if PDF generated
-    if 'pdf_file' in st.session_state and st.session_state.pdf_file:
-        # Get settings
-        settings = st.session_state.get('pdf_settings', {})
-        assessment_type = settings.get('assessment_type', 'practice')
-        answer_key_option = settings.get('answer_key_option', 'No answer key')
-        selected_variations = settings.get('selected_variations', [])
-        selected_contexts = settings.get('selected_contexts', [])
-        
-        # Clear the generation flag
-        st.session_state.generate_pdf = False
-        
-        # Big success banner
-        st.success("🎉 **PDF Generated Successfully!**")
-        st.balloons()
-        
-        st.markdown('<div class="pdf-section">', unsafe_allow_html=True)
-        
-        # Read PDF file
-        try:
-            with open(st.session_state.pdf_file, 'rb') as f:
-                pdf_bytes = f.read()
-            
-            # Create filename for download
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            download_name = f"{assessment_type}_{timestamp}.pdf"
+                with _phase("generate"):
+                    questions = generator.generate_many(specs)
+                skill_sections = _skill_sections(specs, questions)
+                
+                if not skill_sections:
+                    st.error("No questions were generated! Check your selections.")
+                    st.stop()
+                
+                st.info(f"Generated {len(skill_sections)} sections with {sum(len(s['questions']) for s in skill_sections)} total questions")
+                
+                with _phase("pdf"):
+                    pdf_bytes = render_pdf_bytes(
+                        "worksheet",
+                        "Mean Calculation Worksheet",
+                        skill_sections,
+                        answer_key_type
+                    )
             
-            # Show PDF info
-            col_info1, col_info2 = st.columns(2)
-            with col_info1:
-                st.metric("Assessment Type", assessment_type.title())
-                st.metric("Answer Key", answer_key_option)
-            with col_info2:
-                st.metric("Question Types", len(selected_variations))
-                st.metric("Contexts Used", len(selected_contexts))
+            elif assessment_type == "quiz":
+                # Progressive difficulty with selected variations
+                num_questions_per = settings.num_questions_per
+                
+                # Every context gets the same (variation, difficulty) rotation;
+                # only the (context, variation) pairs the context supports become specs
+                schedule = [
+                    (selected_variations[i % len(selected_variations)], diff)
+                    for i, diff in enumerate(QUIZ_DIFFS[:num_questions_per])
+                ]
+                compatible = variation_compat(data_version)
+                specs = [
+                    {
+                        'variation': variation,
+                        'difficulty': diff,
+                        'context_id': context_id,
+                        'level': "standard"
+                    }
+                    for context_id in selected_contexts
+                    for variation, diff in schedule
+                    if context_id in compatible[variation]
+                ]
+                
+                with _phase("generate"):
+                    questions = generator.generate_many(specs)
+                skill_sections = _skill_sections(specs, questions)
+                
+                if not skill_sections:
+                    st.error("No questions were generated! Check your selections.")
+                    st.stop()
+                
+                st.info(f"Generated {len(skill_sections)} sections with {sum(len(s['questions']) for s in skill_sections)} total questions")
+                
+                with _phase("pdf"):
+                    pdf_bytes = render_pdf_bytes(
+                        "quiz",
+                        "Mean Calculation Quiz",
+                        skill_sections,
+                        answer_key_type
+                    )
             
-            st.markdown("---")
+            else:  # test
+                # Comprehensive test with selected variations
+                num_questions_total = settings.num_questions_total
+                
+                # Plan the whole test up front: question k goes to context k mod C, and
+                # i = k // C is that context's own question index for the rotations.
+                # Dealing round-robin keeps the total even when C > num_questions_total.
+                num_contexts = len(selected_contexts)
+                rounds = -(-num_questions_total // num_contexts) if num_contexts else 0
+                schedule = [
+                    (selected_variations[i % len(selected_variations)], TEST_DIFF_CYCLE[i % len(TEST_DIFF_CYCLE)])
+                    for i in range(rounds)
+                ]
+                specs = [
+                    {
+                        'variation': schedule[k // num_contexts][0],
+                        'difficulty': schedule[k // num_contexts][1],
+                        'context_id': selected_contexts[k % num_contexts],
+                        'level': "standard"
+                    }
+                    for k in range(num_questions_total if num_contexts else 0)
+                ]
+                
+                # One metadata lookup per context, not per question
+                skill_names = {ctx_id: meta_table[ctx_id]['ContextName'] for ctx_id in selected_contexts}
+                
+                # Bucket by difficulty while packing (Easy, Medium, Hard), in generation order
+                buckets = {label: [] for label in DIFF_ORDER}
+                with _phase("generate"):
+                    questions = generator.generate_many(specs)
+                for spec, q in zip(specs, questions):
+                    packed = _pack(q, spec['difficulty'])
+                    packed['skill_name'] = skill_names[spec['context_id']]
+                    buckets[packed['difficulty']].append(packed)
+                all_questions = [packed for bucket in buckets.values() for packed in bucket]
+                
+                if not all_questions:
+                    st.error("No questions were generated! Check your selections.")
+                    st.stop()
+                
+                st.info(f"Generated {len(all_questions)} questions")
+                
+                with _phase("pdf"):
+                    pdf_bytes = render_pdf_bytes(
+                        "test",
+                        "Grade 12 Essential Mathematics - Mean Calculation Test",
+                        all_questions,
+                        answer_key_type
+                    )
             
-            # Big prominent download button
-            st.markdown("### 📥 Ready to Download")
-            st.download_button(
-                label=f"⬇️ Download {assessment_type.title()} PDF",
-                data=pdf_bytes,
-                file_name=download_name,
-                mime="application/pdf",
-                type="primary",
-                use_container_width=True
-            )
+            st.session_state.pdf_bytes = pdf_bytes
+            # Name the download once, so it stays the same across reruns of the panel
+            st.session_state.pdf_download_name = f"{assessment_type}_{datetime.now():%Y%m%d_%H%M%S}.pdf"
             
-            st.info(f"💡 **Tip:** The file will be saved as `{download_name}` in your Downloads folder")
+            # Don't rerun - let the download section appear below
             
         except Exception as e:
-            st.error(f"Error reading PDF file: {e}")
+            st.error(f"Error generating PDF: {e}")
+            import traceback
+            st.code(traceback.format_exc())
+
+def _discard_pdf():
+    """Drop the finished PDF and its download name from session state"""
+    st.session_state.pop('pdf_bytes', None)
+    st.session_state.pop('pdf_download_name', None)
+
+@st.fragment
+def render_pdf_download():
+    """Download panel for the most recently generated PDF; clicking Download reruns only this panel"""
+    # Get settings
+    settings = st.session_state.get('pdf_settings') or PDFSettings()
+    assessment_type = settings.assessment_type
+    answer_key_option = settings.answer_key_option
+    selected_variations = settings.selected_variations
+    selected_contexts = settings.selected_contexts
+    
+    # Big success banner
+    st.success("🎉 **PDF Generated Successfully!**")
+    st.balloons()
+    
+    st.markdown('<div class="pdf-section">', unsafe_allow_html=True)
+    
+    try:
+        pdf_bytes = st.session_state.pdf_bytes
         
-        st.markdown('</div>', unsafe_allow_html=True)
+        download_name = st.session_state.pdf_download_name
+        
+        # Show PDF info
+        col_info1, col_info2 = st.columns(2)
+        with col_info1:
+            st.metric("Assessment Type", assessment_type.title())
+            st.metric("Answer Key", answer_key_option)
+        with col_info2:
+            st.metric("Question Types", len(selected_variations))
+            st.metric("Contexts Used", len(selected_contexts))
         
         st.markdown("---")
         
-        # Generate another button
-        col_again1, col_again2 = st.columns([1, 1])
-        with col_again1:
-            if st.button("🔄 Generate Another PDF", use_container_width=True):
-                st.session_state.pdf_file = None
-                st.rerun()
-        with col_again2:
-            if st.button("📝 Back to Single Question Mode", use_container_width=True):
-                st.session_state.mode = 'single'
-                st.session_state.pdf_file = None
-                st.rerun()
+        # Big prominent download button
+        st.markdown("### 📥 Ready to Download")
+        st.download_button(
+            label=f"⬇️ Download {assessment_type.title()} PDF",
+            data=pdf_bytes,
+            file_name=download_name,
+            mime="application/pdf",
+            type="primary",
+            use_container_width=True
+        )
+        
+        st.info(f"💡 **Tip:** The file will be saved as `{download_name}` in your Downloads folder")
+        
+        # Where the last build spent its time (a fast "pdf" phase is a render_pdf_bytes cache hit)
+        phases = st.session_state.get('pdf_phases')
+        if phases:
+            with st.expander("⚙️ Perf"):
+                phase_df = pd.DataFrame(phases, columns=['phase', 'ms'])
+                st.dataframe(phase_df.groupby('phase', sort=False)['ms'].agg(['sum', 'count', 'mean']).round(1))
+        
+    except Exception as e:
+        st.error(f"Error preparing PDF download: {e}")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Generate another button (st.rerun leaves this fragment for a full-app rerun)
+    col_again1, col_again2 = st.columns([1, 1])
+    with col_again1:
+        if st.button("🔄 Generate Another PDF", use_container_width=True):
+            _discard_pdf()
+            st.rerun()
+    with col_again2:
+        if st.button("📝 Back to Single Question Mode", use_container_width=True):
+            st.session_state.mode = 'single'
+            _discard_pdf()
+            st.rerun()
+
+def render_pdf_mode():
+    """PDF mode: settings fragment in the sidebar, help/generation/download in the main column"""
+    with st.sidebar:
+        render_pdf_sidebar()
+    
+    # Main content
+    st.header("PDF Assessment Generator")
+    
+    if not st.session_state.get('pdf_can_generate', False):
+        render_pdf_help()
+    
+    elif st.session_state.pop('generate_pdf', False):
+        # Cleared before building, so a rerun that interrupts or follows this
+        # one cannot start the same generation a second time
+        build_pdf()
+    
+    # Show download button if PDF generated
+    if st.session_state.get('pdf_bytes'):
+        render_pdf_download()
+
+
+# =======================
+# MODE DISPATCH
+# =======================
+if st.session_state.mode == 'single':
+    render_single_mode()
+
+else:
+    render_pdf_mode()
 
 # Footer
 st.markdown("---")
@@ -9,9 +9,53 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from dataclasses import dataclass
 from datetime import datetime
+from importlib.util import find_spec
+from typing import Any, Tuple
+import copy
+import io
 import random
 
+# True when reportlab's optional C accelerator (installed by reportlab[accel])
+# is available; otherwise stringWidth, escapePDF and ASCII85 encoding fall back
+# to their pure-Python versions and builds run slower
+RL_ACCEL = any(find_spec(name) is not None for name in ('_rl_accel', 'rl_accel'))
+
+# (date, "Month DD, YYYY") for the header date, reformatted only when the day changes
+_date_label_cache = (None, '')
+
+
+def _date_label(now):
+    """Header date for now (e.g. January 02, 2024)"""
+    global _date_label_cache
+    today = now.date()
+    if _date_label_cache[0] != today:
+        _date_label_cache = (today, now.strftime("%B %d, %Y"))
+    return _date_label_cache[1]
+
+
+@dataclass(frozen=True, slots=True)
+class PrintedQuestion:
+    """The fields of a question dict that the builders print, read once per build"""
+    text: str
+    answer: Any
+    steps: Tuple[str, ...] = ()
+    difficulty: str = 'Medium'
+    skill_name: str = ''
+    
+    @classmethod
+    def from_dict(cls, q):
+        """Normalize a question dict ('question', 'answer', optional 'steps', 'difficulty', 'skill_name')"""
+        return cls(
+            q['question'],
+            q['answer'],
+            tuple(q.get('steps') or ()),
+            q.get('difficulty', 'Medium'),
+            q.get('skill_name', '')
+        )
+
 
 class MathAssessmentGenerator:
     """Generate mathematics assessment PDFs"""
@@ -19,6 +63,19 @@ class MathAssessmentGenerator:
     def __init__(self):
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
+        
+        # Load the fonts' metrics now rather than during the first build
+        for font_name in {style.fontName for style in self.styles.byName.values()
+                          if hasattr(style, 'fontName')}:
+            stringWidth('0', font_name, 10)
+        
+        # Student info table layout, shared by every build (setStyle only reads it)
+        self._info_col_widths = (4*inch, 2.5*inch)
+        self._info_table_style = TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ])
     
     def _setup_custom_styles(self):
         """Create custom paragraph styles for assessments"""
@@ -83,83 +140,215 @@ class MathAssessmentGenerator:
             fontName='Helvetica-Bold'
         ))
     
-    def create_practice_page(self, skill_name, questions, answer_key_type=None, filename=None):
+    def _paragraph_cache(self):
         """
-        Create a practice page focusing on a single skill
+        Paragraph factory for one build: each (text, style) pair is parsed once, and
+        repeats (question numbers and skill headers in the answer key, "Steps:",
+        common step lines) get a shallow copy of the parsed Paragraph. Platypus
+        cannot lay out one flowable instance twice in a story, hence the copies.
+        """
+        cache = {}
         
-        Args:
-            skill_name: Name of the skill being practiced
-            questions: List of question dictionaries
-            answer_key_type: None, 'answers_only', or 'with_steps'
-            filename: Output filename (default: auto-generated in temp directory)
+        def para(text, style_name):
+            key = (text, style_name)
+            parsed = cache.get(key)
+            if parsed is None:
+                parsed = cache[key] = Paragraph(text, self.styles[style_name])
+            return copy.copy(parsed)
         
-        Returns:
-            filepath to the generated PDF
-        """
+        return para
+    
+    def _append_answer(self, story, para, q, answer_key_type):
+        """Append one PrintedQuestion's answer (and its steps for 'with_steps') to an answer key story"""
+        if answer_key_type not in ('answers_only', 'with_steps'):
+            return
+        story.append(para(f"Answer: {q.answer}", 'AnswerText'))
+        if answer_key_type == 'with_steps' and q.steps:
+            story.append(para("Steps:", 'AnswerText'))
+            for step in q.steps:
+                story.append(para(f"• {step}", 'AnswerText'))
+    
+    def _temp_filename(self, file_prefix):
+        """Timestamped PDF path in the temp directory, for builds without a filename"""
         import tempfile
         import os
         
-        if filename is None:
-            # Use temp directory
-            temp_dir = tempfile.gettempdir()
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = os.path.join(temp_dir, f"practice_{skill_name.replace(' ', '_')}_{timestamp}.pdf")
-        
-        doc = SimpleDocTemplate(filename, pagesize=letter,
-                                topMargin=0.75*inch, bottomMargin=0.75*inch,
-                                leftMargin=1*inch, rightMargin=1*inch)
+        # Microseconds keep same-type builds within one second (e.g. create_many) apart
+        now = datetime.now()
+        return os.path.join(tempfile.gettempdir(), f"{file_prefix}_{now:%Y%m%d_%H%M%S}_{now.microsecond:06d}.pdf")
+    
+    def _build_chunked(self, questions, chunk_size, answer_key_type, filename, return_bytes, layout):
+        """
+        _build a flat question list as separate documents of at most chunk_size
+        questions (all question chunks, then the answer key chunks) and merge them
+        with pypdf, so layout memory is bounded by a chunk rather than the whole
+        assessment. Each chunk starts on a new page. Requires pypdf (optional).
+        """
+        import tempfile
+        import os
+        try:
+            from pypdf import PdfWriter
+        except ImportError as e:
+            raise ImportError("chunk_size requires pypdf (pip install pypdf)") from e
         
-        story = []
+        if filename is None and not return_bytes:
+            filename = self._temp_filename(layout['file_prefix'])
         
-        # Header
-        story.append(Paragraph("Mathematics Practice", self.styles['AssessmentTitle']))
-        story.append(Paragraph(f"Skill: {skill_name}", self.styles['Heading2']))
-        story.append(Spacer(1, 0.2*inch))
+        starts = range(0, len(questions), chunk_size)
+        parts = [('questions', start) for start in starts]
+        if answer_key_type:
+            parts += [('answers', start) for start in starts]
+        
+        writer = PdfWriter()
+        with tempfile.TemporaryDirectory() as chunk_dir:
+            for n, (part, start) in enumerate(parts):
+                chunk_file = os.path.join(chunk_dir, f"chunk_{n}.pdf")
+                self._build(
+                    sections=[(None, questions[start:start + chunk_size])],
+                    answer_key_type=answer_key_type,
+                    filename=chunk_file,
+                    return_bytes=False,
+                    part=part,
+                    front=start == 0,
+                    first_number=start + 1,
+                    **layout
+                )
+                writer.append(chunk_file)
+            
+            output = io.BytesIO() if return_bytes else filename
+            writer.write(output)
+        return output.getvalue() if return_bytes else filename
+    
+    def _make_doc(self, output):
+        """Letter-size document with the standard assessment margins, writing to output"""
+        return SimpleDocTemplate(output, pagesize=letter,
+                                 topMargin=0.75*inch, bottomMargin=0.75*inch,
+                                 leftMargin=1*inch, rightMargin=1*inch)
+    
+    def _build(self, *, header, info_rows, sections, question_label, answer_key_type,
+               filename, return_bytes, file_prefix, instructions=(), instructions_space=0.2*inch,
+               question_space=0.15*inch, answer_space=0.1*inch, part='all', front=True, first_number=1):
+        """
+        Lay out and write one assessment; the create_* methods differ only in these arguments
         
-        # Student info section
-        info_table = Table([
-            ['Name: _______________________________', f'Date: {datetime.now().strftime("%B %d, %Y")}'],
-            ['', f'Questions: {len(questions)}']
-        ], colWidths=[4*inch, 2.5*inch])
+        Args:
+            header: (text, style name) pairs for the title block
+            info_rows: Student info rows below the Name/Date row
+            sections: (skill name or None, questions) pairs; None means no section header
+            question_label: Callable (question number, PrintedQuestion) -> question heading
+            answer_key_type: None, 'answers_only', or 'with_steps'
+            filename: Output filename or writable binary stream (None: temp file)
+            return_bytes: Build in memory and return the PDF bytes instead of writing filename
+            file_prefix: Temp file name prefix when filename is None
+            instructions: (text, style name) pairs shown above the questions
+            instructions_space, question_space, answer_space: Spacer heights
+            part: 'all', or only the 'questions' / 'answers' of a chunked build
+            front: Start with the title block (or the "Answer Key" heading);
+                   False for continuation chunks
+            first_number: Number of the first question
         
-        info_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        story.append(info_table)
-        story.append(Spacer(1, 0.3*inch))
+        Returns:
+            filepath to the generated PDF (PDF bytes if return_bytes)
+        """
+        if filename is None and not return_bytes:
+            filename = self._temp_filename(file_prefix)
         
-        # Questions
-        for i, q in enumerate(questions, 1):
-            story.append(Paragraph(f"Question {i}", self.styles['QuestionNumber']))
-            story.append(Paragraph(q['question'], self.styles['QuestionText']))
-            story.append(Spacer(1, 0.15*inch))
+        output = io.BytesIO() if return_bytes else filename
+        doc = self._make_doc(output)
         
-        # Answer key on separate page if requested
-        if answer_key_type:
-            story.append(PageBreak())
-            story.append(Paragraph("Answer Key", self.styles['AssessmentTitle']))
+        story = []
+        para = self._paragraph_cache()
+        with_questions = part != 'answers'
+        with_answers = bool(answer_key_type) and part != 'questions'
+        
+        if with_questions and front:
+            # Header
+            for text, style_name in header:
+                story.append(para(text, style_name))
             story.append(Spacer(1, 0.2*inch))
             
-            for i, q in enumerate(questions, 1):
-                story.append(Paragraph(f"Question {i}", self.styles['QuestionNumber']))
-                
-                if answer_key_type == 'answers_only':
-                    story.append(Paragraph(f"Answer: {q['answer']}", self.styles['AnswerText']))
-                elif answer_key_type == 'with_steps':
-                    story.append(Paragraph(f"Answer: {q['answer']}", self.styles['AnswerText']))
-                    if 'steps' in q and q['steps']:
-                        story.append(Paragraph("Steps:", self.styles['AnswerText']))
-                        for step in q['steps']:
-                            story.append(Paragraph(f"• {step}", self.styles['AnswerText']))
+            # Student info
+            info_table = Table([
+                ['Name: _______________________________', f'Date: {_date_label(datetime.now())}'],
+                *info_rows
+            ], colWidths=self._info_col_widths)
+            
+            info_table.setStyle(self._info_table_style)
+            story.append(info_table)
+            story.append(Spacer(1, 0.3*inch))
+            
+            # Instructions
+            if instructions:
+                for text, style_name in instructions:
+                    story.append(para(text, style_name))
+                story.append(Spacer(1, instructions_space))
+        
+        # Questions by section, with the answer key collected in the same pass
+        answer_story = []
+        question_num = first_number
+        for skill_name, questions in sections:
+            if skill_name is not None:
+                skill_header = f"Skill: {skill_name}"
+                if with_questions:
+                    story.append(para(skill_header, 'SectionHeader'))
+                if with_answers:
+                    answer_story.append(para(skill_header, 'SectionHeader'))
+            
+            for q in map(PrintedQuestion.from_dict, questions):
+                label = question_label(question_num, q)
+                if with_questions:
+                    story.append(para(label, 'QuestionNumber'))
+                    story.append(para(q.text, 'QuestionText'))
+                    story.append(Spacer(1, question_space))
                 
-                story.append(Spacer(1, 0.1*inch))
+                if with_answers:
+                    answer_story.append(para(label, 'QuestionNumber'))
+                    self._append_answer(answer_story, para, q, answer_key_type)
+                    answer_story.append(Spacer(1, answer_space))
+                question_num += 1
+            
+            if skill_name is not None and with_questions:
+                story.append(Spacer(1, 0.15*inch))
+        
+        # Answer key on separate page if requested
+        if with_answers:
+            if with_questions:
+                story.append(PageBreak())
+            if front:
+                story.append(para("Answer Key", 'AssessmentTitle'))
+                story.append(Spacer(1, 0.2*inch))
+            story.extend(answer_story)
         
         doc.build(story)
-        return filename
+        return output.getvalue() if return_bytes else filename
     
-    def create_worksheet(self, title, skill_sections, answer_key_type=None, filename=None):
+    def create_practice_page(self, skill_name, questions, answer_key_type=None, filename=None, return_bytes=False):
+        """
+        Create a practice page focusing on a single skill
+        
+        Args:
+            skill_name: Name of the skill being practiced
+            questions: List of question dictionaries
+            answer_key_type: None, 'answers_only', or 'with_steps'
+            filename: Output filename or writable binary stream such as io.BytesIO
+                      (default: auto-generated in temp directory)
+            return_bytes: Build in memory and return the PDF bytes instead of writing filename
+        
+        Returns:
+            filepath to the generated PDF (PDF bytes if return_bytes)
+        """
+        return self._build(
+            header=[("Mathematics Practice", 'AssessmentTitle'), (f"Skill: {skill_name}", 'Heading2')],
+            info_rows=[['', f'Questions: {len(questions)}']],
+            sections=[(None, questions)],
+            question_label=lambda num, q: f"Question {num}",
+            answer_key_type=answer_key_type,
+            filename=filename,
+            return_bytes=return_bytes,
+            file_prefix=f"practice_{skill_name.replace(' ', '_')}"
+        )
+    
+    def create_worksheet(self, title, skill_sections, answer_key_type=None, filename=None, return_bytes=False):
         """
         Create a worksheet with multiple skills
         
@@ -167,91 +356,27 @@ class MathAssessmentGenerator:
             title: Worksheet title
             skill_sections: List of dicts with 'skill_name' and 'questions'
             answer_key_type: None, 'answers_only', or 'with_steps'
-            filename: Output filename
+            filename: Output filename or writable binary stream such as io.BytesIO
+            return_bytes: Build in memory and return the PDF bytes instead of writing filename
         
         Returns:
-            filepath to the generated PDF
+            filepath to the generated PDF (PDF bytes if return_bytes)
         """
-        import tempfile
-        import os
-        
-        if filename is None:
-            temp_dir = tempfile.gettempdir()
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = os.path.join(temp_dir, f"worksheet_{timestamp}.pdf")
-        
-        doc = SimpleDocTemplate(filename, pagesize=letter,
-                                topMargin=0.75*inch, bottomMargin=0.75*inch,
-                                leftMargin=1*inch, rightMargin=1*inch)
-        
-        story = []
-        
-        # Header
-        story.append(Paragraph(title, self.styles['AssessmentTitle']))
-        story.append(Spacer(1, 0.2*inch))
-        
-        # Student info
         total_questions = sum(len(section['questions']) for section in skill_sections)
-        info_table = Table([
-            ['Name: _______________________________', f'Date: {datetime.now().strftime("%B %d, %Y")}'],
-            ['', f'Total Questions: {total_questions}']
-        ], colWidths=[4*inch, 2.5*inch])
-        
-        info_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        story.append(info_table)
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Instructions
-        story.append(Paragraph("Instructions: Complete all questions. Show your work.", 
-                              self.styles['Normal']))
-        story.append(Spacer(1, 0.2*inch))
-        
-        # Sections
-        question_num = 1
-        for section in skill_sections:
-            story.append(Paragraph(f"Skill: {section['skill_name']}", self.styles['SectionHeader']))
-            
-            for q in section['questions']:
-                story.append(Paragraph(f"Question {question_num}", self.styles['QuestionNumber']))
-                story.append(Paragraph(q['question'], self.styles['QuestionText']))
-                story.append(Spacer(1, 0.15*inch))
-                question_num += 1
-            
-            story.append(Spacer(1, 0.15*inch))
-        
-        # Answer key
-        if answer_key_type:
-            story.append(PageBreak())
-            story.append(Paragraph("Answer Key", self.styles['AssessmentTitle']))
-            story.append(Spacer(1, 0.2*inch))
-            
-            question_num = 1
-            for section in skill_sections:
-                story.append(Paragraph(f"Skill: {section['skill_name']}", self.styles['SectionHeader']))
-                
-                for q in section['questions']:
-                    story.append(Paragraph(f"Question {question_num}", self.styles['QuestionNumber']))
-                    
-                    if answer_key_type == 'answers_only':
-                        story.append(Paragraph(f"Answer: {q['answer']}", self.styles['AnswerText']))
-                    elif answer_key_type == 'with_steps':
-                        story.append(Paragraph(f"Answer: {q['answer']}", self.styles['AnswerText']))
-                        if 'steps' in q and q['steps']:
-                            story.append(Paragraph("Steps:", self.styles['AnswerText']))
-                            for step in q['steps']:
-                                story.append(Paragraph(f"• {step}", self.styles['AnswerText']))
-                    
-                    story.append(Spacer(1, 0.08*inch))
-                    question_num += 1
-        
-        doc.build(story)
-        return filename
+        return self._build(
+            header=[(title, 'AssessmentTitle')],
+            info_rows=[['', f'Total Questions: {total_questions}']],
+            instructions=[("Instructions: Complete all questions. Show your work.", 'Normal')],
+            sections=[(section['skill_name'], section['questions']) for section in skill_sections],
+            question_label=lambda num, q: f"Question {num}",
+            answer_key_type=answer_key_type,
+            filename=filename,
+            return_bytes=return_bytes,
+            file_prefix="worksheet",
+            answer_space=0.08*inch
+        )
     
-    def create_quiz(self, title, skill_sections, answer_key_type=None, filename=None):
+    def create_quiz(self, title, skill_sections, answer_key_type=None, filename=None, return_bytes=False):
         """
         Create a quiz with increasing difficulty
         
@@ -259,99 +384,30 @@ class MathAssessmentGenerator:
             title: Quiz title
             skill_sections: List of dicts with 'skill_name' and 'questions' (sorted by difficulty)
             answer_key_type: None, 'answers_only', or 'with_steps'
-            filename: Output filename
+            filename: Output filename or writable binary stream such as io.BytesIO
+            return_bytes: Build in memory and return the PDF bytes instead of writing filename
         
         Returns:
-            filepath to the generated PDF
+            filepath to the generated PDF (PDF bytes if return_bytes)
         """
-        import tempfile
-        import os
-        
-        if filename is None:
-            temp_dir = tempfile.gettempdir()
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = os.path.join(temp_dir, f"quiz_{timestamp}.pdf")
-        
-        # Similar to worksheet but with difficulty indicators
-        doc = SimpleDocTemplate(filename, pagesize=letter,
-                                topMargin=0.75*inch, bottomMargin=0.75*inch,
-                                leftMargin=1*inch, rightMargin=1*inch)
-        
-        story = []
-        
-        # Header
-        story.append(Paragraph(title, self.styles['AssessmentTitle']))
-        story.append(Spacer(1, 0.2*inch))
-        
-        # Student info
+        # Like a worksheet, plus a score line and difficulty indicators
         total_questions = sum(len(section['questions']) for section in skill_sections)
-        info_table = Table([
-            ['Name: _______________________________', f'Date: {datetime.now().strftime("%B %d, %Y")}'],
-            ['', f'Total Questions: {total_questions}'],
-            ['', 'Score: ______ / ______']
-        ], colWidths=[4*inch, 2.5*inch])
-        
-        info_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        story.append(info_table)
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Instructions
-        story.append(Paragraph("Instructions: Answer all questions. Show your work for full credit. "
-                              "Questions increase in difficulty.", 
-                              self.styles['Normal']))
-        story.append(Spacer(1, 0.2*inch))
-        
-        # Sections with difficulty progression
-        question_num = 1
-        for section in skill_sections:
-            story.append(Paragraph(f"Skill: {section['skill_name']}", self.styles['SectionHeader']))
-            
-            for i, q in enumerate(section['questions']):
-                # Add difficulty indicator
-                difficulty = q.get('difficulty', 'Medium')
-                story.append(Paragraph(f"Question {question_num} ({difficulty})", 
-                                      self.styles['QuestionNumber']))
-                story.append(Paragraph(q['question'], self.styles['QuestionText']))
-                story.append(Spacer(1, 0.15*inch))
-                question_num += 1
-            
-            story.append(Spacer(1, 0.15*inch))
-        
-        # Answer key
-        if answer_key_type:
-            story.append(PageBreak())
-            story.append(Paragraph("Answer Key", self.styles['AssessmentTitle']))
-            story.append(Spacer(1, 0.2*inch))
-            
-            question_num = 1
-            for section in skill_sections:
-                story.append(Paragraph(f"Skill: {section['skill_name']}", self.styles['SectionHeader']))
-                
-                for q in section['questions']:
-                    difficulty = q.get('difficulty', 'Medium')
-                    story.append(Paragraph(f"Question {question_num} ({difficulty})", 
-                                          self.styles['QuestionNumber']))
-                    
-                    if answer_key_type == 'answers_only':
-                        story.append(Paragraph(f"Answer: {q['answer']}", self.styles['AnswerText']))
-                    elif answer_key_type == 'with_steps':
-                        story.append(Paragraph(f"Answer: {q['answer']}", self.styles['AnswerText']))
-                        if 'steps' in q and q['steps']:
-                            story.append(Paragraph("Steps:", self.styles['AnswerText']))
-                            for step in q['steps']:
-                                story.append(Paragraph(f"• {step}", self.styles['AnswerText']))
-                    
-                    story.append(Spacer(1, 0.08*inch))
-                    question_num += 1
-        
-        doc.build(story)
-        return filename
+        return self._build(
+            header=[(title, 'AssessmentTitle')],
+            info_rows=[['', f'Total Questions: {total_questions}'], ['', 'Score: ______ / ______']],
+            instructions=[("Instructions: Answer all questions. Show your work for full credit. "
+                           "Questions increase in difficulty.", 'Normal')],
+            sections=[(section['skill_name'], section['questions']) for section in skill_sections],
+            question_label=lambda num, q: f"Question {num} ({q.difficulty})",
+            answer_key_type=answer_key_type,
+            filename=filename,
+            return_bytes=return_bytes,
+            file_prefix="quiz",
+            answer_space=0.08*inch
+        )
     
-    def create_test(self, title, all_skills_questions, answer_key_type=None, filename=None):
+    def create_test(self, title, all_skills_questions, answer_key_type=None, filename=None, return_bytes=False,
+                    chunk_size=None):
         """
         Create a comprehensive test with all skills at increasing difficulty
         
@@ -359,96 +415,82 @@ class MathAssessmentGenerator:
             title: Test title
             all_skills_questions: List of question dicts sorted by difficulty across all skills
             answer_key_type: None, 'answers_only', or 'with_steps'
-            filename: Output filename
+            filename: Output filename or writable binary stream such as io.BytesIO
+            return_bytes: Build in memory and return the PDF bytes instead of writing filename
+            chunk_size: For very large tests, lay out at most this many questions per
+                        document and merge the chunks with pypdf (each chunk starts a new page)
         
         Returns:
-            filepath to the generated PDF
+            filepath to the generated PDF (PDF bytes if return_bytes)
         """
-        import tempfile
-        import os
-        
-        if filename is None:
-            temp_dir = tempfile.gettempdir()
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = os.path.join(temp_dir, f"test_{timestamp}.pdf")
-        
-        doc = SimpleDocTemplate(filename, pagesize=letter,
-                                topMargin=0.75*inch, bottomMargin=0.75*inch,
-                                leftMargin=1*inch, rightMargin=1*inch)
-        
-        story = []
-        
-        # Header
-        story.append(Paragraph(title, self.styles['AssessmentTitle']))
-        story.append(Spacer(1, 0.2*inch))
-        
-        # Student info
-        info_table = Table([
-            ['Name: _______________________________', f'Date: {datetime.now().strftime("%B %d, %Y")}'],
-            ['Class: _______________________________', f'Total Questions: {len(all_skills_questions)}'],
-            ['', 'Score: ______ / ______']
-        ], colWidths=[4*inch, 2.5*inch])
-        
-        info_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        story.append(info_table)
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Instructions
-        story.append(Paragraph("Instructions:", self.styles['Heading2']))
-        story.append(Paragraph("• Read each question carefully", self.styles['Normal']))
-        story.append(Paragraph("• Show all your work for full credit", self.styles['Normal']))
-        story.append(Paragraph("• Questions progress from easier to more challenging", self.styles['Normal']))
-        story.append(Paragraph("• Use the back of pages if you need more space", self.styles['Normal']))
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Questions
-        for i, q in enumerate(all_skills_questions, 1):
-            difficulty = q.get('difficulty', 'Medium')
-            skill = q.get('skill_name', '')
-            
-            story.append(Paragraph(f"Question {i} - {skill} ({difficulty})", 
-                                  self.styles['QuestionNumber']))
-            story.append(Paragraph(q['question'], self.styles['QuestionText']))
-            story.append(Spacer(1, 0.2*inch))
-        
-        # Answer key
-        if answer_key_type:
-            story.append(PageBreak())
-            story.append(Paragraph("Answer Key", self.styles['AssessmentTitle']))
-            story.append(Spacer(1, 0.2*inch))
-            
-            for i, q in enumerate(all_skills_questions, 1):
-                difficulty = q.get('difficulty', 'Medium')
-                skill = q.get('skill_name', '')
-                
-                story.append(Paragraph(f"Question {i} - {skill} ({difficulty})", 
-                                      self.styles['QuestionNumber']))
-                
-                if answer_key_type == 'answers_only':
-                    story.append(Paragraph(f"Answer: {q['answer']}", self.styles['AnswerText']))
-                elif answer_key_type == 'with_steps':
-                    story.append(Paragraph(f"Answer: {q['answer']}", self.styles['AnswerText']))
-                    if 'steps' in q and q['steps']:
-                        story.append(Paragraph("Steps:", self.styles['AnswerText']))
-                        for step in q['steps']:
-                            story.append(Paragraph(f"• {step}", self.styles['AnswerText']))
-                
-                story.append(Spacer(1, 0.1*inch))
-        
-        doc.build(story)
-        return filename
+        layout = dict(
+            header=[(title, 'AssessmentTitle')],
+            info_rows=[
+                ['Class: _______________________________', f'Total Questions: {len(all_skills_questions)}'],
+                ['', 'Score: ______ / ______']
+            ],
+            instructions=[
+                ("Instructions:", 'Heading2'),
+                ("• Read each question carefully", 'Normal'),
+                ("• Show all your work for full credit", 'Normal'),
+                ("• Questions progress from easier to more challenging", 'Normal'),
+                ("• Use the back of pages if you need more space", 'Normal'),
+            ],
+            instructions_space=0.3*inch,
+            question_label=lambda num, q: f"Question {num} - {q.skill_name} ({q.difficulty})",
+            file_prefix="test",
+            question_space=0.2*inch
+        )
+        
+        if chunk_size and len(all_skills_questions) > chunk_size:
+            return self._build_chunked(all_skills_questions, chunk_size, answer_key_type,
+                                       filename, return_bytes, layout)
+        return self._build(
+            sections=[(None, all_skills_questions)],
+            answer_key_type=answer_key_type,
+            filename=filename,
+            return_bytes=return_bytes,
+            **layout
+        )
+
+
+# Batch builds: each PDF is independent, so a batch fans out over worker processes
+# (doc.build holds the GIL, which rules out threads)
+_worker_generator = None
+
+
+def _create_one(config):
+    """Pool task: run one create_* call on this worker's generator"""
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = MathAssessmentGenerator()
+    kwargs = dict(config)
+    method = kwargs.pop('method')
+    return getattr(_worker_generator, method)(**kwargs)
+
+
+def create_many(configs, max_workers=None):
+    """
+    Build several assessments in parallel worker processes
+    
+    Args:
+        configs: List of dicts with 'method' (a create_* method name) plus that
+                 method's keyword arguments
+        max_workers: Number of worker processes (default: os.cpu_count())
+    
+    Returns:
+        The create_* results in config order (filepaths, or PDF bytes with return_bytes)
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_create_one, configs))
 
 
 # Example usage and demo
 def create_demo_assessments():
     """Create sample assessments to demonstrate the system"""
     
-    generator = MathAssessmentGenerator()
-    
     # Sample questions for mean calculation
     sample_questions_easy = [
         {
@@ -509,65 +551,70 @@ def create_demo_assessments():
         }
     ]
     
-    # 1. Practice Page
-    print("Creating practice page...")
-    practice_file = generator.create_practice_page(
-        skill_name="Calculating Mean (Average)",
-        questions=sample_questions_easy + sample_questions_medium[:1],
-        answer_key_type='with_steps'
-    )
-    print(f"✓ Practice page created: {practice_file}")
-    
-    # 2. Worksheet
-    print("\nCreating worksheet...")
-    worksheet_file = generator.create_worksheet(
-        title="Mean Calculation Worksheet",
-        skill_sections=[
-            {
-                'skill_name': 'Calculating Mean - Easy',
-                'questions': sample_questions_easy
-            },
-            {
-                'skill_name': 'Calculating Mean - Medium',
-                'questions': sample_questions_medium
-            }
-        ],
-        answer_key_type='answers_only'
-    )
-    print(f"✓ Worksheet created: {worksheet_file}")
-    
-    # 3. Quiz
-    print("\nCreating quiz...")
-    quiz_file = generator.create_quiz(
-        title="Mean Calculation Quiz",
-        skill_sections=[
-            {
-                'skill_name': 'Mean Calculation',
-                'questions': sample_questions_easy[:1] + sample_questions_medium[:1] + sample_questions_hard
-            }
-        ],
-        answer_key_type='with_steps'
-    )
-    print(f"✓ Quiz created: {quiz_file}")
+    # Build all four in parallel worker processes
+    print("Creating practice page, worksheet, quiz and test...")
+    all_questions = [
+        {**q, 'skill_name': 'Mean Calculation'}
+        for q in sample_questions_easy + sample_questions_medium + sample_questions_hard
+    ]
     
-    # 4. Test
-    print("\nCreating test...")
-    all_questions = sample_questions_easy + sample_questions_medium + sample_questions_hard
-    for q in all_questions:
-        q['skill_name'] = 'Mean Calculation'
+    files = create_many([
+        # 1. Practice Page
+        {
+            'method': 'create_practice_page',
+            'skill_name': "Calculating Mean (Average)",
+            'questions': sample_questions_easy + sample_questions_medium[:1],
+            'answer_key_type': 'with_steps'
+        },
+        # 2. Worksheet
+        {
+            'method': 'create_worksheet',
+            'title': "Mean Calculation Worksheet",
+            'skill_sections': [
+                {
+                    'skill_name': 'Calculating Mean - Easy',
+                    'questions': sample_questions_easy
+                },
+                {
+                    'skill_name': 'Calculating Mean - Medium',
+                    'questions': sample_questions_medium
+                }
+            ],
+            'answer_key_type': 'answers_only'
+        },
+        # 3. Quiz
+        {
+            'method': 'create_quiz',
+            'title': "Mean Calculation Quiz",
+            'skill_sections': [
+                {
+                    'skill_name': 'Mean Calculation',
+                    'questions': sample_questions_easy[:1] + sample_questions_medium[:1] + sample_questions_hard
+                }
+            ],
+            'answer_key_type': 'with_steps'
+        },
+        # 4. Test
+        {
+            'method': 'create_test',
+            'title': "Grade 12 Essential Mathematics - Unit Test",
+            'all_skills_questions': all_questions,
+            'answer_key_type': 'with_steps'
+        },
+    ])
     
-    test_file = generator.create_test(
-        title="Grade 12 Essential Mathematics - Unit Test",
-        all_skills_questions=all_questions,
-        answer_key_type='with_steps'
-    )
-    print(f"✓ Test created: {test_file}")
+    for label, path in zip(("Practice page", "Worksheet", "Quiz", "Test"), files):
+        print(f"✓ {label} created: {path}")
     
-    return [practice_file, worksheet_file, quiz_file, test_file]
+    return files
 
 
 if __name__ == "__main__":
     print("=== Mathematics Assessment PDF Generator ===\n")
+    if RL_ACCEL:
+        print("reportlab C accelerator: loaded\n")
+    else:
+        print("reportlab C accelerator: not found (optional; pip install 'reportlab[accel]')\n")
     files = create_demo_assessments()
     print("\n=== All assessments created successfully! ===")
     print(f"\nGenerated {len(files)} PDF files")
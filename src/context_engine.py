@@ -13,6 +13,11 @@ from datetime import datetime
 import pandas as pd
 
 
+# Boolean columns of the ContextCompatibility sheet (one per variation)
+VARIATION_FLAGS = ['calculate', 'missing_value', 'missing_count', 'compare',
+                   'effect_add', 'effect_remove', 'word_problem', 'estimation']
+
+
 @dataclass
 class ContextMetadata:
     """Metadata about a context from ContextBanks.xlsx"""
@@ -82,7 +87,7 @@ class BankLoader:
     
     def __init__(self, excel_path: str = "data/ContextBanks.xlsx"):
         self.excel_path = excel_path
-        self.cache_dir = Path("data/cache")
+        self.cache_dir = Path(excel_path).parent / "cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
         self.cache_path = self.cache_dir / "context_banks.json"
@@ -127,14 +132,15 @@ class BankLoader:
         """Load from Excel and save to cache"""
         banks = {}
         
-        # Load each sheet
-        banks['metadata'] = self._load_metadata()
-        banks['compatibility'] = self._load_compatibility()
-        banks['templates'] = self._load_templates()
-        banks['stems'] = self._load_stems()
-        banks['presentations'] = self._load_presentations()
-        banks['durations'] = self._load_durations()
-        banks['comparisons'] = self._load_comparisons()
+        # Load each sheet (open and parse the workbook once, not once per sheet)
+        with pd.ExcelFile(self.excel_path) as xls:
+            banks['metadata'] = self._load_metadata(xls)
+            banks['compatibility'] = self._load_compatibility(xls)
+            banks['templates'] = self._load_templates(xls)
+            banks['stems'] = self._load_stems(xls)
+            banks['presentations'] = self._load_presentations(xls)
+            banks['durations'] = self._load_durations(xls)
+            banks['comparisons'] = self._load_comparisons(xls)
         
         # Save to cache
         with open(self.cache_path, 'w') as f:
@@ -154,27 +160,24 @@ class BankLoader:
         
         return banks
     
-    def _load_metadata(self) -> List[Dict]:
+    def _load_metadata(self, xls: pd.ExcelFile) -> List[Dict]:
         """Load ContextMetadata sheet"""
-        df = pd.read_excel(self.excel_path, sheet_name='ContextMetadata')
+        df = pd.read_excel(xls, sheet_name='ContextMetadata')
         return df.to_dict('records')
     
-    def _load_compatibility(self) -> List[Dict]:
+    def _load_compatibility(self, xls: pd.ExcelFile) -> List[Dict]:
         """Load ContextCompatibility sheet"""
-        df = pd.read_excel(self.excel_path, sheet_name='ContextCompatibility')
+        df = pd.read_excel(xls, sheet_name='ContextCompatibility')
         
         # Convert TRUE/FALSE strings to booleans
-        bool_cols = ['calculate', 'missing_value', 'missing_count', 'compare',
-                     'effect_add', 'effect_remove', 'word_problem', 'estimation']
-        
-        for col in bool_cols:
+        for col in VARIATION_FLAGS:
             df[col] = df[col].astype(str).str.upper() == 'TRUE'
         
         return df.to_dict('records')
     
-    def _load_templates(self) -> List[Dict]:
+    def _load_templates(self, xls: pd.ExcelFile) -> List[Dict]:
         """Load ContextTemplates sheet"""
-        df = pd.read_excel(self.excel_path, sheet_name='ContextTemplates')
+        df = pd.read_excel(xls, sheet_name='ContextTemplates')
         
         # Convert TRUE/FALSE to booleans
         bool_cols = ['UsesName', 'UsesLocation', 'UsesJob', 'UsesCourse', 'UsesVenue']
@@ -184,24 +187,24 @@ class BankLoader:
         
         return df.to_dict('records')
     
-    def _load_stems(self) -> List[Dict]:
+    def _load_stems(self, xls: pd.ExcelFile) -> List[Dict]:
         """Load SentenceStems sheet"""
-        df = pd.read_excel(self.excel_path, sheet_name='SentenceStems')
+        df = pd.read_excel(xls, sheet_name='SentenceStems')
         return df.to_dict('records')
     
-    def _load_presentations(self) -> List[Dict]:
+    def _load_presentations(self, xls: pd.ExcelFile) -> List[Dict]:
         """Load DataPresentations sheet"""
-        df = pd.read_excel(self.excel_path, sheet_name='DataPresentations')
+        df = pd.read_excel(xls, sheet_name='DataPresentations')
         return df.to_dict('records')
     
-    def _load_durations(self) -> List[Dict]:
+    def _load_durations(self, xls: pd.ExcelFile) -> List[Dict]:
         """Load Durations sheet"""
-        df = pd.read_excel(self.excel_path, sheet_name='Durations')
+        df = pd.read_excel(xls, sheet_name='Durations')
         return df.to_dict('records')
     
-    def _load_comparisons(self) -> List[Dict]:
+    def _load_comparisons(self, xls: pd.ExcelFile) -> List[Dict]:
         """Load ComparisonPhrases sheet"""
-        df = pd.read_excel(self.excel_path, sheet_name='ComparisonPhrases')
+        df = pd.read_excel(xls, sheet_name='ComparisonPhrases')
         return df.to_dict('records')
 
 
@@ -244,6 +247,15 @@ class ContextEngine:
             for item in self.banks['compatibility']
         }
         
+        # Index compatible context_ids by variation
+        self.variation_index = {
+            variation: [
+                context_id for context_id, compat in self.compatibility_index.items()
+                if compat.get(variation, False)
+            ]
+            for variation in VARIATION_FLAGS
+        }
+        
         # Index templates by context_id and level
         self.templates_index = {}
         for item in self.banks['templates']:
@@ -294,11 +306,7 @@ class ContextEngine:
         Returns:
             List of context_ids that support this variation
         """
-        compatible = []
-        for context_id, compat in self.compatibility_index.items():
-            if compat.get(variation, False):
-                compatible.append(context_id)
-        return compatible
+        return list(self.variation_index.get(variation, []))
     
     def get_context_metadata(self, context_id: str) -> Optional[Dict]:
         """Get metadata for a context"""
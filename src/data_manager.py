@@ -3,8 +3,11 @@ Data Manager - Interface to WorksheetMergeMasterSourceFile.xlsx
 Provides access to names, cities, venues, jobs, etc.
 """
 
+import json
+import os
 import pandas as pd
 import random
+from datetime import datetime
 from typing import Dict, List, Optional
 from pathlib import Path
 
@@ -12,37 +15,44 @@ from pathlib import Path
 class DataManager:
     """Manages all lookup tables from the master source file"""
     
+    # Excel sheet name -> table key
+    SHEETS = {
+        'Names': 'names',
+        'PlacesCDN': 'places_cdn',
+        'Theaters': 'theaters',
+        'Courses': 'courses',
+        'SummerJobs': 'summer_jobs',
+        'Vehicles': 'vehicles',
+        'Currency': 'currency',
+        'Municipalities': 'municipalities',
+        'Businesses': 'businesses',
+    }
+    
     def __init__(self, excel_path: str):
         self.excel_path = excel_path
         self._tables: Dict[str, pd.DataFrame] = {}
+        
+        # Parquet copies of the sheets, reused while the Excel file is unchanged
+        self.cache_dir = Path(excel_path).parent / "cache"
+        self.cache_meta_path = self.cache_dir / "lookup_tables_meta.json"
+        
         self._load_all_tables()
     
     def _load_all_tables(self):
         """Load all sheets into memory"""
+        if self._load_from_parquet():
+            print(f"📦 Loaded {len(self._tables)} lookup tables from cache")
+            return
+        
         try:
             excel_file = pd.ExcelFile(self.excel_path)
             
             # Load each relevant sheet
             available_sheets = excel_file.sheet_names
             
-            if 'Names' in available_sheets:
-                self._tables['names'] = pd.read_excel(excel_file, 'Names')
-            if 'PlacesCDN' in available_sheets:
-                self._tables['places_cdn'] = pd.read_excel(excel_file, 'PlacesCDN')
-            if 'Theaters' in available_sheets:
-                self._tables['theaters'] = pd.read_excel(excel_file, 'Theaters')
-            if 'Courses' in available_sheets:
-                self._tables['courses'] = pd.read_excel(excel_file, 'Courses')
-            if 'SummerJobs' in available_sheets:
-                self._tables['summer_jobs'] = pd.read_excel(excel_file, 'SummerJobs')
-            if 'Vehicles' in available_sheets:
-                self._tables['vehicles'] = pd.read_excel(excel_file, 'Vehicles')
-            if 'Currency' in available_sheets:
-                self._tables['currency'] = pd.read_excel(excel_file, 'Currency')
-            if 'Municipalities' in available_sheets:
-                self._tables['municipalities'] = pd.read_excel(excel_file, 'Municipalities')
-            if 'Businesses' in available_sheets:
-                self._tables['businesses'] = pd.read_excel(excel_file, 'Businesses')
+            for sheet_name, key in self.SHEETS.items():
+                if sheet_name in available_sheets:
+                    self._tables[key] = pd.read_excel(excel_file, sheet_name)
                 
             print(f"✓ Loaded {len(self._tables)} lookup tables")
             
@@ -50,6 +60,62 @@ class DataManager:
             print(f"Warning: Could not load lookup tables: {e}")
             # Initialize empty tables as fallback
             self._initialize_fallback_data()
+            return
+        
+        self._save_to_parquet()
+    
+    def _parquet_path(self, key: str) -> Path:
+        """Cache file for one lookup table"""
+        return self.cache_dir / f"lookup_{key}.parquet"
+    
+    def _load_from_parquet(self) -> bool:
+        """Load tables from the parquet cache if it matches the Excel file"""
+        if not self.cache_meta_path.exists() or not os.path.exists(self.excel_path):
+            return False
+        
+        try:
+            with open(self.cache_meta_path, 'r') as f:
+                meta = json.load(f)
+            
+            if meta.get('excel_mtime') != os.path.getmtime(self.excel_path):
+                return False
+            
+            self._tables = {
+                key: pd.read_parquet(self._parquet_path(key))
+                for key in meta.get('tables', [])
+            }
+            return True
+        except Exception as e:
+            print(f"Warning: Could not read lookup table cache: {e}")
+            self._tables = {}
+            return False
+    
+    def _save_to_parquet(self):
+        """Write loaded tables to the parquet cache (best effort)"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for key, df in self._tables.items():
+                self._parquet_safe(df).to_parquet(self._parquet_path(key))
+            
+            meta = {
+                'excel_mtime': os.path.getmtime(self.excel_path),
+                'cached_at': datetime.now().isoformat(),
+                'tables': list(self._tables)
+            }
+            with open(self.cache_meta_path, 'w') as f:
+                json.dump(meta, f, indent=2)
+        except Exception as e:
+            print(f"Warning: Could not cache lookup tables: {e}")
+    
+    @staticmethod
+    def _parquet_safe(df: pd.DataFrame) -> pd.DataFrame:
+        """Store mixed-type text columns (e.g. QTY "2 or 4" next to ints) as strings"""
+        df = df.copy()
+        for col in df.columns[df.dtypes == object]:
+            values = df[col].dropna()
+            if values.map(type).nunique() > 1:
+                df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v))
+        return df
     
     def _initialize_fallback_data(self):
         """Create minimal fallback data if Excel file not available"""
@@ -44,6 +44,14 @@ class MeanGeneratorV2:
         self.data = data_manager
         self.calc = StatisticsCalculator()
         self.engine = ContextEngine(data_manager, excel_path)
+        
+        # variation -> (generator method, default marks)
+        self._variations = {
+            "calculate": (self._generate_calculate, 1),
+            "missing_value": (self._generate_missing_value, 2),
+            "compare": (self._generate_compare, 2),
+            "missing_count": (self._generate_missing_count, 2),
+        }
     
     def generate(self,
                  variation: str = "calculate",
@@ -72,16 +80,50 @@ class MeanGeneratorV2:
             context_id = random.choice(compatible)
         
         # Route to appropriate variation generator
-        if variation == "calculate":
-            return self._generate_calculate(context_id, difficulty, level, marks or 1)
-        elif variation == "missing_value":
-            return self._generate_missing_value(context_id, difficulty, level, marks or 2)
-        elif variation == "compare":
-            return self._generate_compare(context_id, difficulty, level, marks or 2)
-        elif variation == "missing_count":
-            return self._generate_missing_count(context_id, difficulty, level, marks or 2)
-        else:
+        if variation not in self._variations:
             raise ValueError(f"Variation '{variation}' not yet implemented")
+        method, default_marks = self._variations[variation]
+        return method(context_id, difficulty, level, marks or default_marks)
+    
+    def generate_many(self, specs: List[dict]) -> List[Question]:
+        """
+        Generate a batch of questions in one call.
+        
+        Args:
+            specs: One dict per question holding generate() keyword arguments
+                   (variation, difficulty, context_id, level, marks)
+        
+        Returns:
+            List of Question objects in spec order
+        
+        Compatible contexts are looked up once per variation for the whole
+        batch rather than once per question.
+        """
+        compatible = {}
+        questions = []
+        
+        for spec in specs:
+            variation = spec.get("variation", "calculate")
+            if variation not in self._variations:
+                raise ValueError(f"Variation '{variation}' not yet implemented")
+            
+            context_id = spec.get("context_id")
+            if context_id is None:
+                if variation not in compatible:
+                    compatible[variation] = self.engine.get_compatible_contexts(variation)
+                if not compatible[variation]:
+                    raise ValueError(f"No contexts support variation '{variation}'")
+                context_id = random.choice(compatible[variation])
+            
+            method, default_marks = self._variations[variation]
+            questions.append(method(
+                context_id,
+                spec.get("difficulty", 2),
+                spec.get("level", "standard"),
+                spec.get("marks") or default_marks
+            ))
+        
+        return questions
     
     def _generate_calculate(self, context_id: str, difficulty: int, level: str, marks: int) -> Question:
         """
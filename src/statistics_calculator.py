@@ -14,7 +14,10 @@ class StatisticsCalculator:
     @staticmethod
     def calculate_mean(data: List[Union[int, float]]) -> float:
         """Calculate arithmetic mean"""
-        return np.mean(data)
+        # Question datasets hold 5-20 values; plain Python beats building a NumPy array
+        if not data:
+            return np.mean(data)  # nan with a RuntimeWarning, as before
+        return sum(data) / len(data)
     
     @staticmethod
     def calculate_median(data: List[Union[int, float]]) -> float:
@@ -0,0 +1,56 @@
+"""
+The app's cached context data must follow edits to the workbooks
+(load_system and the derived caches are keyed on the data files' mtimes)
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import openpyxl
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _compatible_count(at):
+    return int(next(m.value for m in at.metric if m.label == "Compatible with this variation"))
+
+
+def _disable_calculate(workbook_path, count):
+    """Set calculate to FALSE for the first count contexts that support it"""
+    wb = openpyxl.load_workbook(workbook_path)
+    ws = wb["ContextCompatibility"]
+    column = [cell.value for cell in ws[1]].index("calculate") + 1
+    changed = 0
+    for row in range(2, ws.max_row + 1):
+        cell = ws.cell(row=row, column=column)
+        if cell.value is True and changed < count:
+            cell.value = False
+            changed += 1
+    wb.save(workbook_path)
+    
+    # Make sure the edit is visible as a new mtime even on coarse filesystem clocks
+    mtime = os.path.getmtime(workbook_path) + 10
+    os.utime(workbook_path, (mtime, mtime))
+
+
+def test_workbook_edit_refreshes_compatible_count(tmp_path, monkeypatch):
+    for name in ("app.py", "ui_constants.py", "math_pdf_generator.py"):
+        shutil.copy(REPO_ROOT / name, tmp_path / name)
+    shutil.copytree(REPO_ROOT / "src", tmp_path / "src")
+    shutil.copytree(REPO_ROOT / "data", tmp_path / "data")
+    monkeypatch.chdir(tmp_path)
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    
+    at = AppTest.from_file(str(tmp_path / "app.py"), default_timeout=120)
+    at.run()
+    assert not at.exception
+    before = _compatible_count(at)
+    
+    _disable_calculate(tmp_path / "data" / "ContextBanks.xlsx", 10)
+    at.run()
+    assert not at.exception
+    assert _compatible_count(at) == before - 10
@@ -0,0 +1,20 @@
+"""StatisticsCalculator.calculate_mean keeps NumPy's results, including for empty input"""
+
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from statistics_calculator import StatisticsCalculator
+
+
+def test_calculate_mean():
+    assert StatisticsCalculator.calculate_mean([2, 4, 9]) == 5
+
+
+def test_calculate_mean_empty_is_nan():
+    with pytest.warns(RuntimeWarning):
+        assert math.isnan(StatisticsCalculator.calculate_mean([]))
@@ -0,0 +1,195 @@
+"""
+UI Constants - Labels, static content and the PDF settings record for the Streamlit app
+Kept in an imported module so they are built once per process, not on every rerun
+"""
+
+import re
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Optional, Tuple
+
+# Page styles, written readably and collapsed once at import to a compact <style> tag
+_CSS_RULES = """
+    .main-header {
+        font-size: 2.5rem;
+        font-weight: bold;
+        color: #1E88E5;
+        margin-bottom: 0;
+    }
+    .sub-header {
+        font-size: 1.2rem;
+        color: #666;
+        margin-top: 0;
+    }
+    .context-box {
+        background-color: #f0f8ff;
+        padding: 20px;
+        border-radius: 10px;
+        border-left: 5px solid #1E88E5;
+        margin: 10px 0;
+    }
+    .question-box {
+        background-color: #fff;
+        padding: 20px;
+        border-radius: 10px;
+        border: 2px solid #ddd;
+        margin: 10px 0;
+    }
+    .answer-box {
+        background-color: #e8f5e9;
+        padding: 15px;
+        border-radius: 10px;
+        border-left: 5px solid #4CAF50;
+        margin: 10px 0;
+    }
+    .stats-card {
+        background-color: #fff;
+        padding: 15px;
+        border-radius: 10px;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        margin: 5px 0;
+    }
+    .pdf-section {
+        background-color: #fff3e0;
+        padding: 20px;
+        border-radius: 10px;
+        border-left: 5px solid #FF9800;
+        margin: 20px 0;
+    }
+"""
+CSS = "<style>" + re.sub(r"\s*([{};:,])\s*", r"\1", _CSS_RULES.strip()) + "</style>"
+
+# Widget labels (read-only so widgets can share them as format_func lookups)
+VARIATION_LABELS = MappingProxyType({
+    "calculate": "📊 Calculate Mean",
+    "missing_value": "🎯 Find Missing Value",
+    "compare": "⚖️ Compare Means",
+    "missing_count": "🔢 Find Number of Values"
+})
+
+# Variation option order shared by every variation widget
+VARIATIONS = tuple(VARIATION_LABELS)
+
+# Plain variation names for PDF titles and question metadata
+VARIATION_NAMES = MappingProxyType({
+    variation: variation.replace('_', ' ').title() for variation in VARIATION_LABELS
+})
+
+LEVEL_LABELS = {
+    "minimal": "📄 Minimal (1 sentence)",
+    "standard": "📖 Standard (Brief scenario)",
+    "rich": "📚 Rich (Full backstory)"
+}
+
+# Answer key radio option -> answer_key_type passed to the PDF builders
+ANSWER_KEY_TYPES = MappingProxyType({
+    "No answer key": None,
+    "Answers only": "answers_only",
+    "Full solutions with steps": "with_steps"
+})
+
+# PDF difficulty label per difficulty level (1-indexed)
+DIFF_LABELS = ('', 'Easy', 'Easy', 'Medium', 'Hard', 'Hard')
+DIFF_ORDER = ('Easy', 'Medium', 'Hard')
+
+# Difficulty rotations: quiz questions per context, and the progressive test cycle
+QUIZ_DIFFS = (1, 2, 3)
+TEST_DIFF_CYCLE = (1, 1, 2, 2, 3, 3, 4, 4, 5, 5)
+
+# Example questions shown beside the generator
+EXAMPLES = [
+    {
+        "title": "💰 Server Tips (Minimal)",
+        "text": "Ms. Lee works as a server. Tips over 5 days: $45, $52, $48, $50, $55. Calculate the mean.",
+        "answer": "$50.00"
+    },
+    {
+        "title": "❤️ Heart Rate (Rich)",
+        "text": "Dr. Singh works as a sports medicine specialist. She is evaluating an athlete's cardiovascular fitness...",
+        "answer": "Detailed scenario with exercise stages"
+    },
+    {
+        "title": "📁 File Sizes (Standard)",
+        "text": "Project file sizes recorded: 145MB, 203MB, 178MB, 195MB, 220MB. Calculate the mean file size.",
+        "answer": "188.2 MB"
+    },
+    {
+        "title": "🎵 Music Tempo",
+        "text": "A DJ tracked BPM for songs: 120 bpm, 128 bpm, 115 bpm, 132 bpm, 125 bpm",
+        "answer": "124.0 bpm"
+    }
+]
+
+# Context category reference
+CATEGORIES_INFO = {
+    "Physical": "Lengths, areas, volumes, masses",
+    "Recreation": "Running, cycling, music, playlists",
+    "Health": "Heart rate, calories, blood pressure",
+    "Transportation": "Speeds, distances, commute times",
+    "Household": "Cooking, utilities, groceries",
+    "Academic": "Test scores, attendance, grades",
+    "Environmental": "Temperature, rainfall, snowfall",
+    "Digital": "File sizes, download speeds, data",
+    "Earnings": "Tips, wages",
+    "Financial": "Home prices, bills"
+}
+
+
+@dataclass(frozen=True, slots=True)
+class PDFSettings:
+    """Sidebar settings captured by the Generate PDF button"""
+    assessment_type: str = "practice"
+    selected_variations: Tuple[str, ...] = ("calculate",)
+    selected_contexts: Tuple[str, ...] = ()
+    answer_key_type: Optional[str] = None
+    answer_key_option: str = "No answer key"
+    num_questions: Optional[int] = 5          # practice
+    num_questions_per: Optional[int] = 3      # worksheet / quiz
+    num_questions_total: Optional[int] = 15   # test
+    difficulty: Optional[int] = 2             # practice / worksheet
+
+
+@dataclass(frozen=True)
+class AssessmentSpec:
+    """What differs between the PDF assessment types, for the sidebar and build_pdf"""
+    label: str
+    pdf_builder: str                    # MathAssessmentGenerator method
+    count_field: str                    # PDFSettings field holding the question count
+    form_count_label: str               # count slider label in the Step 5 form
+    count_label: str                    # count slider label in the lower sidebar settings
+    count_range: Tuple[int, int, int]   # slider min, max, default
+    progressive: bool                   # difficulty progresses instead of one fixed level
+    min_contexts: int
+    max_contexts: Optional[int] = None
+    max_variations: Optional[int] = None
+    progress_note: Optional[str] = None # Step 5 note shown in place of the difficulty slider
+
+
+ASSESSMENTS = MappingProxyType({
+    "practice": AssessmentSpec(
+        "📝 Practice Page", "create_practice_page", "num_questions",
+        "Questions", "Number of questions",
+        (3, 15, 5), progressive=False, min_contexts=1, max_contexts=1, max_variations=1
+    ),
+    "worksheet": AssessmentSpec(
+        "📋 Worksheet", "create_worksheet", "num_questions_per",
+        "Questions per context", "Questions per skill",
+        (2, 8, 3), progressive=False, min_contexts=2, max_contexts=4, max_variations=4
+    ),
+    "quiz": AssessmentSpec(
+        "📊 Quiz", "create_quiz", "num_questions_per",
+        "Questions per context", "Questions per skill",
+        (2, 5, 3), progressive=True, min_contexts=2, max_contexts=3, max_variations=3,
+        progress_note="💡 Difficulty will progress Easy → Medium → Hard"
+    ),
+    "test": AssessmentSpec(
+        "📖 Test", "create_test", "num_questions_total",
+        "Total questions", "Total questions",
+        (10, 30, 15), progressive=True, min_contexts=3, max_contexts=8,
+        progress_note="💡 Difficulty will progress across all questions"
+    ),
+})
+
+ASSESSMENT_LABELS = MappingProxyType({
+    assessment_type: spec.label for assessment_type, spec in ASSESSMENTS.items()
+})